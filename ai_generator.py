@@ -214,7 +214,9 @@ class AIContentGenerator:
     
     def _extract_json(self, text: str) -> str:
         """Extract JSON from AI response (handles markdown code blocks)"""
-        text = text.strip()
+        text = text.strip() if text else ''
+        if not text:
+            raise ValueError("Empty AI response, no JSON to extract")
         
         # Remove markdown code blocks
         text = re.sub(r'^```(?:json)?\s*', '', text, flags=re.MULTILINE)
@@ -330,48 +332,54 @@ class AIContentGenerator:
         
         return result
     
-    def generate_intro(self, keyword: str) -> str:
-        """Generate introduction paragraph (55-110 words)"""
-        logging.info(f"📝 Generating introduction for: {keyword}")
-        
-        # Direct instruction to output ONLY the intro in plain text
-        prompt = (
+    def _intro_prompt(self, keyword: str) -> str:
+        """Build the intro prompt: ask for ONLY the intro in plain text"""
+        return (
             f'Write a 80-word engaging introduction for a comparison article about "{keyword}". '
             'Be conversational and trustworthy. '
             'Start your response with "Here is your answer:" followed by the paragraph. '
             'No markdown, no bold formatting, no extra explanations or thinking.'
         )
+    
+    def _finalize_intro(self, raw_intro: str) -> str:
+        """Clean a raw intro response into the final paragraph"""
+        # Clean aggressively
+        intro = self._clean_intro(raw_intro)
+        
+        # If still too short or contains meta-text, extract last sentence cluster
+        if len(intro.split()) < 40:
+            sentences = re.split(r'(?<=[.!?])\s+', raw_intro)
+            # Get last 2-3 sentences that don't look like meta-text
+            clean_sentences = []
+            for sent in reversed(sentences):
+                if len(sent) > 20 and not any(word in sent.lower() for word in ['word', 'paragraph', 'intro', 'write', 'must', 'output']):
+                    clean_sentences.insert(0, sent)
+                    if len(' '.join(clean_sentences).split()) >= 40:
+                        break
+            if clean_sentences:
+                intro = ' '.join(clean_sentences)
+        
+        intro = intro.strip()
+        
+        # Remove any markdown bold formatting if present
+        intro = re.sub(r'\*\*(.+?)\*\*', r'\1', intro)
+        return intro
+    
+    def generate_intro(self, keyword: str) -> str:
+        """Generate introduction paragraph (55-110 words)"""
+        logging.info(f"📝 Generating introduction for: {keyword}")
         
         try:
             # Use llama-3.3-70b for intro (cleaner output, less reasoning)
             raw_intro = self.client.generate(
-                prompt=prompt,
+                prompt=self._intro_prompt(keyword),
                 max_tokens=512,
                 temperature=0.2,
                 stream=True,
                 model_override='qwen-3-235b-a22b-instruct-2507'
             )
             
-            # Clean aggressively
-            intro = self._clean_intro(raw_intro)
-            
-            # If still too short or contains meta-text, extract last sentence cluster
-            if len(intro.split()) < 40:
-                sentences = re.split(r'(?<=[.!?])\s+', raw_intro)
-                # Get last 2-3 sentences that don't look like meta-text
-                clean_sentences = []
-                for sent in reversed(sentences):
-                    if len(sent) > 20 and not any(word in sent.lower() for word in ['word', 'paragraph', 'intro', 'write', 'must', 'output']):
-                        clean_sentences.insert(0, sent)
-                        if len(' '.join(clean_sentences).split()) >= 40:
-                            break
-                if clean_sentences:
-                    intro = ' '.join(clean_sentences)
-            
-            intro = intro.strip()
-            
-            # Remove any markdown bold formatting if present
-            intro = re.sub(r'\*\*(.+?)\*\*', r'\1', intro)
+            intro = self._finalize_intro(raw_intro)
             
             word_count = len(intro.split())
             logging.info(f"✅ Introduction generated ({word_count} words)")
@@ -380,6 +388,25 @@ class AIContentGenerator:
             logging.error(f"❌ Failed to generate intro: {e}")
             raise
     
+    def generate_intros_batch(self, keyword: str, n: int = 10) -> list:
+        """Generate n intro variants for the same keyword in a single batched request"""
+        logging.info(f"📝 Generating {n} introductions for: {keyword}")
+        
+        try:
+            raw_intros = self.client.generate_batch(
+                [self._intro_prompt(keyword)] * n,
+                max_tokens=512,
+                temperature=0.2,
+                model_override='qwen-3-235b-a22b-instruct-2507'
+            )
+            
+            intros = [self._finalize_intro(raw) for raw in raw_intros]
+            logging.info(f"✅ {sum(1 for intro in intros if intro)}/{n} introductions generated")
+            return intros
+        except Exception as e:
+            logging.error(f"❌ Failed to generate intros: {e}")
+            raise
+    
     def generate_badges(self, keyword: str, products: list) -> dict:
         """
         Generate badges for all products + select top recommendation
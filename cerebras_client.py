@@ -4,7 +4,9 @@ Based on cerebras_client_standalone.py
 """
 import os
 import time
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from cerebras.cloud.sdk import Cerebras
 
 # Enable DEBUG level logging for this module
@@ -13,16 +15,26 @@ logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %
 class CerebrasClient:
     """Cerebras API client with automatic key rotation"""
     
-    def __init__(self, api_keys_file: str, model: str = "gpt-oss-120b", cache_file: str = "cerebras_key_cache.txt"):
-        """Initialize Cerebras client with API keys from file"""
+    def __init__(self, api_keys_file: str = None, model: str = "gpt-oss-120b", cache_file: str = "cerebras_key_cache.txt", api_keys: tuple = None):
+        """Initialize Cerebras client with API keys from file (or already-loaded api_keys)"""
         self.model = model
         self.cache_file = cache_file
         self.client = None
         self.api_keys = []
         self.key_index = -1  # Initialize key_index
         self.failed_keys = set() # Initialize failed_keys
-        self._load_api_keys(api_keys_file)
+        if api_keys is not None:
+            self.api_keys = list(api_keys)
+            if not self.api_keys:
+                raise ValueError("No API keys")
+        else:
+            self._load_api_keys(api_keys_file)
         self._initialize_client()
+    
+    @classmethod
+    def from_keys(cls, keys: tuple, model: str = "gpt-oss-120b", cache_file: str = "cerebras_key_cache.txt") -> "CerebrasClient":
+        """Create a client from pre-parsed API keys, skipping the keys file read"""
+        return cls(model=model, cache_file=cache_file, api_keys=keys)
         
     def _load_api_keys(self, filepath: str):
         """Load API keys from file"""
@@ -215,96 +227,50 @@ class CerebrasClient:
         logging.error("❌ No available API keys after rotation (all tried or failed)")
         return False
     
-    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.7, stream: bool = False, use_reasoning: bool = True, model_override: str = None, system_prompt: str = None) -> str:
-        """Generate text using Cerebras AI with retry logic
+    def _build_request(self, prompt: str, max_tokens: int, temperature: float, stream: bool,
+                       use_reasoning: bool, model_override: str, system_prompt: str) -> dict:
+        """Build chat-completion request parameters"""
+        # Use override model if specified, otherwise use default
+        model_to_use = model_override if model_override else self.model
+        
+        # Build messages array
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        # Build request parameters
+        request_params = {
+            "model": model_to_use,
+            "messages": messages,
+            "max_completion_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": stream
+        }
+        
+        # Only add reasoning_effort if use_reasoning is True AND using gpt-oss-120b
+        if use_reasoning and model_to_use == "gpt-oss-120b":
+            request_params["reasoning_effort"] = "medium"
+        
+        return request_params
+    
+    def _create_with_rotation(self, request_params: dict, consume):
+        """Send a chat-completion request, rotating keys on rate-limit/auth errors
         
         Args:
-            prompt: Input prompt
-            max_tokens: Maximum tokens to generate
-            temperature: Sampling temperature
-            stream: Enable streaming response
-            use_reasoning: Add reasoning_effort parameter (for gpt-oss-120b)
-            model_override: Override default model (e.g., 'llama-3.3-70b' for intro)
-            system_prompt: Optional system message to guide model behavior
+            request_params: Chat-completion request parameters
+            consume: Callable that reads the response; it runs inside the retry loop so
+                errors raised while reading a stream also rotate keys and retry
         """
         attempts = 0
         max_attempts = len(self.api_keys) * 2
         
-        # Use override model if specified, otherwise use default
-        model_to_use = model_override if model_override else self.model
-        
         while attempts < max_attempts:
             try:
                 if self._real_client is None:
                     raise RuntimeError("Cerebras client not initialized")
                 
-                # Build messages array
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
-                
-                # Build request parameters
-                request_params = {
-                    "model": model_to_use,
-                    "messages": messages,
-                    "max_completion_tokens": max_tokens,
-                    "temperature": temperature,
-                    "stream": stream
-                }
-                
-                # Only add reasoning_effort if use_reasoning is True AND using gpt-oss-120b
-                if use_reasoning and model_to_use == "gpt-oss-120b":
-                    request_params["reasoning_effort"] = "medium"
-                
-                response = self._real_client.chat.completions.create(**request_params)
-                
-                # Handle streaming response
-                if stream:
-                    content = ""
-                    chunk_count = 0
-                    for chunk in response:
-                        chunk_count += 1
-                        if chunk.choices and len(chunk.choices) > 0:
-                            delta = chunk.choices[0].delta
-                            if hasattr(delta, 'content') and delta.content:
-                                content += delta.content
-                    
-                    logging.debug(f"📊 Streaming: received {chunk_count} chunks, total {len(content)} chars")
-                    
-                    if not content:
-                        logging.warning("⚠️ Empty content from streaming response")
-                    
-                    return content
-                else:
-                    # Non-streaming: get full response
-                    logging.debug(f"📊 Response object type: {type(response)}")
-                    logging.debug(f"📊 Response choices: {len(response.choices) if hasattr(response, 'choices') else 'N/A'}")
-                    
-                    if not response.choices or len(response.choices) == 0:
-                        logging.error(f"❌ No choices in response! Full response: {response}")
-                        return ""
-                    
-                    message = response.choices[0].message
-                    content = message.content if hasattr(message, 'content') and message.content else None
-                    
-                    # gpt-oss-120b sometimes returns content in 'reasoning' field instead of 'content'
-                    if not content and hasattr(message, 'reasoning') and message.reasoning:
-                        logging.info("📝 Using 'reasoning' field as model returned content there")
-                        content = message.reasoning
-                    
-                    logging.debug(f"📊 Content length: {len(content) if content else 0} chars")
-                    
-                    if not content:
-                        logging.warning(f"⚠️ Empty content from response. Message object: {message}")
-                        logging.warning(f"⚠️ Full response object: {response}")
-                    else:
-                        logging.debug(f"📝 Full content: {content}")
-                    
-                    # Save cache after successful generation
-                    self._save_key_cache()
-                    
-                    return content if content else ""
+                return consume(self._real_client.chat.completions.create(**request_params))
                 
             except Exception as e:
                 err_str = str(e).lower()
@@ -336,3 +302,116 @@ class CerebrasClient:
                     raise
         
         raise Exception(f"Failed after {max_attempts} attempts")
+    
+    def _message_content(self, message) -> str:
+        """Extract text from a completion message"""
+        content = message.content if hasattr(message, 'content') and message.content else None
+        
+        # gpt-oss-120b sometimes returns content in 'reasoning' field instead of 'content'
+        if not content and hasattr(message, 'reasoning') and message.reasoning:
+            logging.info("📝 Using 'reasoning' field as model returned content there")
+            content = message.reasoning
+        
+        return content if content else ""
+    
+    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.7, stream: bool = False, use_reasoning: bool = True, model_override: str = None, system_prompt: str = None) -> str:
+        """Generate text using Cerebras AI with retry logic
+        
+        Args:
+            prompt: Input prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            stream: Enable streaming response
+            use_reasoning: Add reasoning_effort parameter (for gpt-oss-120b)
+            model_override: Override default model (e.g., 'llama-3.3-70b' for intro)
+            system_prompt: Optional system message to guide model behavior
+        """
+        request_params = self._build_request(prompt, max_tokens, temperature, stream,
+                                             use_reasoning, model_override, system_prompt)
+        consume = self._read_stream if stream else self._read_response
+        return self._create_with_rotation(request_params, consume)
+    
+    def _read_stream(self, response) -> str:
+        """Accumulate the text of a streaming completion"""
+        content = ""
+        chunk_count = 0
+        for chunk in response:
+            chunk_count += 1
+            if chunk.choices and len(chunk.choices) > 0:
+                delta = chunk.choices[0].delta
+                if hasattr(delta, 'content') and delta.content:
+                    content += delta.content
+        
+        logging.debug(f"📊 Streaming: received {chunk_count} chunks, total {len(content)} chars")
+        
+        if not content:
+            logging.warning("⚠️ Empty content from streaming response")
+        
+        return content
+    
+    def _read_response(self, response) -> str:
+        """Extract the text of a non-streaming completion"""
+        logging.debug(f"📊 Response object type: {type(response)}")
+        logging.debug(f"📊 Response choices: {len(response.choices) if hasattr(response, 'choices') else 'N/A'}")
+        
+        if not response.choices or len(response.choices) == 0:
+            logging.error(f"❌ No choices in response! Full response: {response}")
+            return ""
+        
+        message = response.choices[0].message
+        content = self._message_content(message)
+        
+        logging.debug(f"📊 Content length: {len(content)} chars")
+        
+        if not content:
+            logging.warning(f"⚠️ Empty content from response. Message object: {message}")
+            logging.warning(f"⚠️ Full response object: {response}")
+        else:
+            logging.debug(f"📝 Full content: {content}")
+        
+        # Save cache after successful generation
+        self._save_key_cache()
+        
+        return content
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.7, stream: bool = False, use_reasoning: bool = True, model_override: str = None, system_prompt: str = None) -> str:
+        """Async version of generate(); runs the SDK call in a worker thread so key rotation is shared"""
+        return await asyncio.to_thread(
+            self.generate, prompt, max_tokens=max_tokens, temperature=temperature, stream=stream,
+            use_reasoning=use_reasoning, model_override=model_override, system_prompt=system_prompt
+        )
+    
+    def generate_batch(self, prompts: list, max_tokens: int = 1024, temperature: float = 0.7, use_reasoning: bool = True, model_override: str = None, system_prompt: str = None) -> list:
+        """Generate one completion per prompt with as few requests as possible
+        
+        Identical prompts are collapsed into a single request with n=len(prompts).
+        Cerebras has no batch endpoint, so differing prompts are sent concurrently.
+        
+        Returns:
+            list: Generated texts, in the same order as prompts
+        """
+        if not prompts:
+            return []
+        
+        if len(set(prompts)) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(prompts), 10)) as executor:
+                return list(executor.map(
+                    lambda p: self.generate(p, max_tokens=max_tokens, temperature=temperature,
+                                            use_reasoning=use_reasoning, model_override=model_override,
+                                            system_prompt=system_prompt),
+                    prompts
+                ))
+        
+        request_params = self._build_request(prompts[0], max_tokens, temperature, False,
+                                             use_reasoning, model_override, system_prompt)
+        request_params["n"] = len(prompts)
+        choices = self._create_with_rotation(request_params, lambda response: response.choices or [])
+        
+        if len(choices) < len(prompts):
+            logging.warning(f"⚠️ Requested {len(prompts)} completions, got {len(choices)}")
+        
+        self._save_key_cache()
+        
+        results = [self._message_content(choice.message) for choice in choices]
+        results += [""] * (len(prompts) - len(results))
+        return results[:len(prompts)]
@@ -1,6 +1,8 @@
 """
 ChatZai API Client - Wrapper for chat.z.ai Node.js API
 """
+import asyncio
+import httpx
 import requests
 import logging
 import time
@@ -12,6 +14,9 @@ logger = logging.getLogger(__name__)
 class ChatZaiClient:
     """Client for chat.z.ai API running on Node.js server"""
     
+    # Fixed delay between retry attempts (seconds)
+    RETRY_WAIT = 10
+    
     def __init__(self, api_url: str = "http://localhost:3001", timeout: int = 180, max_retries: int = 3):
         """
         Initialize ChatZai client
@@ -26,6 +31,10 @@ class ChatZaiClient:
         self.max_retries = max_retries
         self.session = requests.Session()
         
+        # Shared async client for agenerate(), created on first use
+        self._async_client = None
+        self._async_loop = None
+        
     def health_check(self) -> bool:
         """
         Check if the API server is running and healthy
@@ -40,7 +49,7 @@ class ChatZaiClient:
             )
             return response.status_code == 200
         except Exception as e:
-            logger.warning(f"ChatZai health check failed: {e}")
+            logger.warning("ChatZai health check failed: %s", e)
             return False
     
     def generate(self, prompt: str, system_prompt: Optional[str] = None, 
@@ -60,70 +69,159 @@ class ChatZaiClient:
         Raises:
             Exception: If generation fails after all retries
         """
-        # Merge system prompt with user prompt if provided
-        full_prompt = prompt
-        if system_prompt:
-            full_prompt = f"{system_prompt}\n\n{prompt}"
-        
-        # ChatZai API only accepts 'prompt' field
-        payload = {
-            "prompt": full_prompt
-        }
+        payload = self._build_payload(prompt, system_prompt)
         
         last_error = None
         for attempt in range(self.max_retries):
             try:
-                logger.info(f"ChatZai generation attempt {attempt + 1}/{self.max_retries}")
+                logger.debug("ChatZai generation attempt %d/%d", attempt + 1, self.max_retries)
                 
                 response = self.session.post(
                     f"{self.api_url}/ask",
                     json=payload,
                     timeout=self.timeout
                 )
+                return self._answer_from(response)
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    # Handle both 'response' and 'answer' fields
-                    if 'response' in data:
-                        result = data['response']
-                        logger.info(f"ChatZai generated {len(result)} characters")
-                        # Check if response looks incomplete (for JSON)
-                        if result.strip().startswith('{') and not result.strip().endswith('}'):
-                            logger.warning(f"⚠️ Response may be incomplete (missing closing brace)")
-                        return result
-                    elif 'answer' in data:
-                        result = data['answer']
-                        logger.info(f"ChatZai generated {len(result)} characters")
-                        # Check if response looks incomplete (for JSON)
-                        if result.strip().startswith('{') and not result.strip().endswith('}'):
-                            logger.warning(f"⚠️ Response may be incomplete (missing closing brace)")
-                        return result
-                    else:
-                        raise Exception(f"Invalid response format: {data}")
-                else:
-                    raise Exception(f"HTTP {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.Timeout as e:
-                last_error = f"Request timeout after {self.timeout}s: {e}"
-                logger.warning(f"{last_error} (attempt {attempt + 1}/{self.max_retries})")
+            except Exception as e:
+                last_error = self._attempt_failed(e, attempt)
+            
+            if self._should_retry(attempt):
+                time.sleep(self.RETRY_WAIT)
+        
+        # All retries failed
+        raise self._retries_exhausted(last_error)
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        max_tokens: int = 4000, temperature: float = 0.7) -> str:
+        """
+        Async version of generate() so several prompts can be awaited concurrently
+        
+        All calls on one event loop share a single pooled httpx.AsyncClient.
+        
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        payload = self._build_payload(prompt, system_prompt)
+        client = self._get_async_client()
+        
+        last_error = None
+        for attempt in range(self.max_retries):
+            try:
+                logger.debug("ChatZai async generation attempt %d/%d", attempt + 1, self.max_retries)
                 
-            except requests.exceptions.ConnectionError as e:
-                last_error = f"Connection error: {e}"
-                logger.warning(f"{last_error} (attempt {attempt + 1}/{self.max_retries})")
+                response = await client.post(f"{self.api_url}/ask", json=payload)
+                return self._answer_from(response)
                 
             except Exception as e:
-                last_error = f"Generation error: {e}"
-                logger.warning(f"{last_error} (attempt {attempt + 1}/{self.max_retries})")
+                last_error = self._attempt_failed(e, attempt)
             
-            # Wait before retry (fixed 10 second delay)
-            if attempt < self.max_retries - 1:
-                wait_time = 10  # 10s between retries
-                logger.info(f"Waiting {wait_time}s before retry...")
-                time.sleep(wait_time)
+            if self._should_retry(attempt):
+                await asyncio.sleep(self.RETRY_WAIT)
         
         # All retries failed
-        raise Exception(f"ChatZai generation failed after {self.max_retries} attempts. Last error: {last_error}")
+        raise self._retries_exhausted(last_error)
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Lazily create the shared AsyncClient (a new one per event loop, since connections are loop-bound)"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client.is_closed or self._async_loop is not loop:
+            self._discard_async_client()
+            self._async_client = httpx.AsyncClient(timeout=self.timeout)
+            self._async_loop = loop
+        return self._async_client
+    
+    def _discard_async_client(self):
+        """Drop the cached AsyncClient, closing it on the loop it belongs to if that loop is still usable"""
+        client, loop = self._async_client, self._async_loop
+        self._async_client = self._async_loop = None
+        if client is None or client.is_closed:
+            return
+        if loop.is_closed():
+            # Its sockets belong to a dead loop and can no longer be closed cleanly
+            logger.warning("ChatZai AsyncClient outlived its event loop; await aclose() before the loop ends")
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            loop.run_until_complete(client.aclose())
+    
+    def _answer_from(self, response) -> str:
+        """Return the answer from a requests/httpx /ask response, or raise on HTTP errors"""
+        if response.status_code == 200:
+            return self._extract_answer(response.json())
+        raise Exception(f"HTTP {response.status_code}: {response.text}")
+    
+    def _attempt_failed(self, error: Exception, attempt: int) -> str:
+        """Log a failed attempt; returns its message for the final error"""
+        if isinstance(error, (requests.exceptions.Timeout, httpx.TimeoutException)):
+            last_error = f"Request timeout after {self.timeout}s: {error}"
+        elif isinstance(error, (requests.exceptions.ConnectionError, httpx.ConnectError)):
+            last_error = f"Connection error: {error}"
+        else:
+            last_error = f"Generation error: {error}"
+        logger.warning("%s (attempt %d/%d)", last_error, attempt + 1, self.max_retries)
+        return last_error
+    
+    def _should_retry(self, attempt: int) -> bool:
+        """True (after logging the wait) if another attempt follows this one"""
+        if attempt < self.max_retries - 1:
+            logger.info("Waiting %ds before retry...", self.RETRY_WAIT)
+            return True
+        return False
+    
+    def _retries_exhausted(self, last_error: Optional[str]) -> Exception:
+        """Error raised once every attempt has failed"""
+        return Exception(f"ChatZai generation failed after {self.max_retries} attempts. Last error: {last_error}")
+    
+    def _build_payload(self, prompt: str, system_prompt: Optional[str]) -> Dict[str, Any]:
+        """Build the /ask request body"""
+        # Merge system prompt with user prompt if provided
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+        
+        # ChatZai API only accepts 'prompt' field
+        return {
+            "prompt": full_prompt
+        }
+    
+    def _extract_answer(self, data: Dict[str, Any]) -> str:
+        """Get generated text from an /ask response body"""
+        # Handle both 'response' and 'answer' fields
+        if 'response' in data:
+            result = data['response']
+        elif 'answer' in data:
+            result = data['answer']
+        else:
+            raise Exception(f"Invalid response format: {data}")
+        
+        logger.debug("ChatZai generated %d characters", len(result))
+        # Check if response looks incomplete (for JSON)
+        if self._missing_closer(result):
+            logger.warning("⚠️ Response may be incomplete (missing closing brace/bracket)")
+        return result
+    
+    def _missing_closer(self, text: str) -> bool:
+        """True if text opens a JSON object/array it never closes (probes ends, no stripped copy)"""
+        i, j = 0, len(text) - 1
+        while i <= j and text[i].isspace():
+            i += 1
+        while j > i and text[j].isspace():
+            j -= 1
+        if i > j:
+            return False
+        first, last = text[i], text[j]
+        return (first == '{' and last != '}') or (first == '[' and last != ']')
+    
+    async def aclose(self):
+        """Close the async client; await this before the loop that ran agenerate() ends"""
+        if self._async_client is not None and self._async_loop is asyncio.get_running_loop():
+            client, self._async_client, self._async_loop = self._async_client, None, None
+            await client.aclose()
+        else:
+            self._discard_async_client()
     
     def close(self):
-        """Close the session"""
+        """Close the session, and the async client if its loop is still usable (async callers should aclose())"""
         self.session.close()
+        self._discard_async_client()
@@ -0,0 +1,27 @@
+"""
+Client Factory - Shared AI client instances
+Reuses clients so key files, key-cache probes and HTTP connection pools
+are set up once per process instead of once per script/test
+"""
+import os
+from functools import lru_cache
+from chat_zai_client import ChatZaiClient
+from cerebras_client import CerebrasClient
+
+
+@lru_cache(maxsize=None)
+def get_cerebras(model: str = 'gpt-oss-120b') -> CerebrasClient:
+    """Get the shared Cerebras client for a model"""
+    return CerebrasClient(
+        api_keys_file=os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt'),
+        model=model
+    )
+
+
+@lru_cache(maxsize=None)
+def get_chat_zai(timeout: int = 180) -> ChatZaiClient:
+    """Get the shared ChatZai client for a request timeout"""
+    return ChatZaiClient(
+        api_url=os.getenv('CHAT_ZAI_API_URL', 'http://localhost:3001'),
+        timeout=timeout
+    )
@@ -29,6 +29,9 @@ logging.basicConfig(
     ]
 )
 
+_INTRO_DIV_RE = re.compile(r'<div class="acap-intro">(.*?)</div>', re.DOTALL)
+_FIRST_P_RE = re.compile(r'<p>(.*?)</p>', re.DOTALL)
+
 class IntroFixer:
     """Fix intro for existing WordPress posts"""
     
@@ -84,16 +87,14 @@ class IntroFixer:
             Intro text or None if not found
         """
         # First try: Look for <div class="acap-intro">...</div>
-        pattern = r'<div class="acap-intro">(.*?)</div>'
-        match = re.search(pattern, html, re.DOTALL)
+        match = _INTRO_DIV_RE.search(html)
         
         if match:
             intro = match.group(1).strip()
             return intro
         
         # Fallback: Look for first <p> tag (old broken intro)
-        p_pattern = r'<p>(.*?)</p>'
-        p_match = re.search(p_pattern, html, re.DOTALL)
+        p_match = _FIRST_P_RE.search(html)
         
         if p_match:
             intro = p_match.group(1).strip()
@@ -118,16 +119,14 @@ class IntroFixer:
         new_intro_html = f'<p>{new_intro}</p>\n'
         
         # Try to replace <div class="acap-intro">...</div> if exists
-        div_pattern = r'<div class="acap-intro">.*?</div>'
-        if re.search(div_pattern, html, re.DOTALL):
-            updated_html = re.sub(div_pattern, new_intro_html.strip(), html, count=1, flags=re.DOTALL)
+        updated_html, replaced = _INTRO_DIV_RE.subn(new_intro_html.strip(), html, count=1)
+        if replaced:
             logging.info("✅ Replaced intro in <div class='acap-intro'> with <p>")
             return updated_html
         
         # Replace first <p> tag (current format)
-        p_pattern = r'<p>.*?</p>'
-        if re.search(p_pattern, html, re.DOTALL):
-            updated_html = re.sub(p_pattern, new_intro_html.strip(), html, count=1, flags=re.DOTALL)
+        updated_html, replaced = _FIRST_P_RE.subn(new_intro_html.strip(), html, count=1)
+        if replaced:
             logging.info("✅ Replaced first <p> tag with new intro")
             return updated_html
         
@@ -12,7 +12,7 @@ try {
     $pythonVersion = python --version 2>&1
     Write-Host "✅ $pythonVersion" -ForegroundColor Green
 } catch {
-    Write-Host "❌ Python not found! Please install Python 3.8 or higher" -ForegroundColor Red
+    Write-Host "❌ Python not found! Please install Python 3.9 or higher" -ForegroundColor Red
     exit 1
 }
 
@@ -1,7 +1,16 @@
+import io
+import json
 import os
+import re
+import sys
 import logging
 import time
+from collections import Counter, namedtuple
 from dotenv import load_dotenv
+try:
+    import orjson  # Optional: faster JSONL encoding
+except ImportError:
+    orjson = None
 from chat_zai_client import ChatZaiClient
 from cerebras_client import CerebrasClient
 from unified_ai_client import UnifiedAIClient
@@ -14,6 +23,39 @@ logging.getLogger('cerebras').setLevel(logging.CRITICAL)
 logging.getLogger('httpx').setLevel(logging.CRITICAL)
 logging.getLogger('httpcore').setLevel(logging.CRITICAL)
 
+TestCase = namedtuple('TestCase', 'keyword expected category')
+
+# ANSI color per classifier result (anything else is shown in red)
+_COLOR = {'review': '\x1b[92m', 'info': '\x1b[94m'}
+_DEFAULT_COLOR = '\x1b[91m'
+_RESET = '\x1b[0m'
+
+# Per-keyword results are appended here as they complete
+RESULTS_FILE = 'classifier_results.jsonl'
+
+def _jsonl_line(record: dict) -> bytes:
+    """Encode one result record as a JSONL line"""
+    if orjson:
+        return orjson.dumps(record) + b'\n'
+    return (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+# Parser debug output is opt-in (set DEBUG_PARSER=1)
+DEBUG = os.getenv('DEBUG_PARSER')
+
+# Section headers in the keywords file (leftmost matching section wins)
+_HEADER_RE = re.compile(
+    r'(?P<review>REVIEW.*INTENT)|(?P<info>INFO.*INTENT)|(?P<geo>SKIP.*GEOGRAPH)'
+    r'|(?P<sensitive>SKIP.*SENSITIVE)|(?P<edge>EDGE)',
+    re.IGNORECASE
+)
+_HEADER_SECTIONS = {
+    'review': ('review', 'REVIEW'),
+    'info': ('info', 'INFO'),
+    'geo': ('skip', 'SKIP (Geo)'),
+    'sensitive': ('skip', 'SKIP (Sensitive)'),
+    'edge': ('unknown', 'EDGE CASES'),
+}
+
 def main():
     load_dotenv()
     
@@ -44,7 +86,8 @@ def main():
     print(f"✅ Loading keywords from: {keywords_file}")
     
     with open(keywords_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+        # splitlines() drops '\n' / '\r\n' terminators up front
+        lines = f.read().splitlines()
     
     print(f"📄 Read {len(lines)} lines from file\n")
     
@@ -57,42 +100,25 @@ def main():
         line = line.strip()
         if not line:
             continue
-        if line.startswith('#'):
-            # Category header
-            line_upper = line.upper()
-            if 'REVIEW' in line_upper and 'INTENT' in line_upper:
-                expected_type = 'review'
-                current_category = 'REVIEW'
-                print(f"DEBUG: Found REVIEW section")
-            elif 'INFO' in line_upper and 'INTENT' in line_upper:
-                expected_type = 'info'
-                current_category = 'INFO'
-                print(f"DEBUG: Found INFO section")
-            elif 'SKIP' in line_upper and 'GEOGRAPHY' in line_upper:
-                expected_type = 'skip'
-                current_category = 'SKIP (Geo)'
-                print(f"DEBUG: Found SKIP Geo section")
-            elif 'SKIP' in line_upper and 'SENSITIVE' in line_upper:
-                expected_type = 'skip'
-                current_category = 'SKIP (Sensitive)'
-                print(f"DEBUG: Found SKIP Sensitive section")
-            elif 'EDGE' in line_upper:
-                expected_type = 'unknown'
-                current_category = 'EDGE CASES'
-                print(f"DEBUG: Found EDGE section")
+        if line[0] == '#':
+            # Category header: one regex pass picks the section
+            match = _HEADER_RE.search(line)
+            if match:
+                expected_type, current_category = _HEADER_SECTIONS[match.lastgroup]
+                if DEBUG:
+                    print(f"DEBUG: Found {current_category} section")
         else:
             # Keyword - only add if we have a category
             if current_category:
-                test_cases.append({
-                    'keyword': line,
-                    'expected': expected_type,
-                    'category': current_category
-                })
-                print(f"DEBUG: Added '{line}' to category '{current_category}'")
+                test_cases.append(TestCase(line, expected_type, current_category))
+                if DEBUG:
+                    print(f"DEBUG: Added '{line}' to category '{current_category}'")
     
     print(f"\n🚀 Comprehensive Classifier Test - {len(test_cases)} test cases\n")
-    print(f"{'KEYWORD':<45} | {'EXPECTED':<8} | {'RESULT':<8} | STATUS")
-    print("-" * 85)
+    # Results table is buffered and written once when all rows are done
+    table = io.StringIO()
+    print(f"{'KEYWORD':<45} | {'EXPECTED':<8} | {'RESULT':<8} | STATUS", file=table)
+    print("-" * 85, file=table)
     
     stats = {
         'total': len(test_cases),
@@ -101,53 +127,47 @@ def main():
         'error': 0
     }
     
-    category_stats = {}
-    
-    for test_case in test_cases:
-        keyword = test_case['keyword']
-        expected = test_case['expected']
-        category = test_case['category']
-        
-        result = generator.classify_keyword(keyword)
-        result_type = result['type']
-        
-        # Initialize category stats
-        if category not in category_stats:
-            category_stats[category] = {'correct': 0, 'total': 0}
-        category_stats[category]['total'] += 1
-        
-        # Check if correct
-        if expected == 'unknown':
-            # Edge case - no expected answer
-            status = "🔍 CHECK"
-            is_correct = None
-        elif result_type == expected:
-            status = "✅ PASS"
-            stats['correct'] += 1
-            category_stats[category]['correct'] += 1
-            is_correct = True
-        else:
-            status = "❌ FAIL"
-            stats['incorrect'] += 1
-            is_correct = False
-        
-        # Color code
-        result_display = result_type.upper()
-        if result_type == 'review':
-            result_display = f"\033[92m{result_display}\033[0m"
-        elif result_type == 'info':
-            result_display = f"\033[94m{result_display}\033[0m"
-        else:
-            result_display = f"\033[91m{result_display}\033[0m"
-        
-        expected_display = expected.upper() if expected and expected != 'unknown' else "N/A"
-        
-        print(f"{keyword:<45} | {expected_display:<8} | {result_display:<17} | {status}")
-        
-        # Small delay
-        time.sleep(0.3)
-    
-    print("-" * 85)
+    category_correct = Counter()
+    category_total = Counter()
+    
+    # Stream each result to disk so long runs can be inspected/recovered mid-way
+    with open(RESULTS_FILE, 'wb') as out:
+        for keyword, expected, category in test_cases:
+            result = generator.classify_keyword(keyword)
+            result_type = result['type']
+            
+            out.write(_jsonl_line({'kw': keyword, 'expected': expected, 'got': result_type, 'category': category}))
+            out.flush()
+            
+            category_total[category] += 1
+            
+            # Check if correct
+            if expected == 'unknown':
+                # Edge case - no expected answer
+                status = "🔍 CHECK"
+                is_correct = None
+            elif result_type == expected:
+                status = "✅ PASS"
+                stats['correct'] += 1
+                category_correct[category] += 1
+                is_correct = True
+            else:
+                status = "❌ FAIL"
+                stats['incorrect'] += 1
+                is_correct = False
+            
+            # Color code
+            result_display = f"{_COLOR.get(result_type, _DEFAULT_COLOR)}{result_type.upper()}{_RESET}"
+            
+            expected_display = expected.upper() if expected and expected != 'unknown' else "N/A"
+            
+            print(f"{keyword:<45} | {expected_display:<8} | {result_display:<17} | {status}", file=table)
+            
+            # Small delay
+            time.sleep(0.3)
+    
+    print("-" * 85, file=table)
+    sys.stdout.write(table.getvalue())
     print(f"\n📊 OVERALL RESULTS:")
     print(f"   Total: {stats['total']}")
     if stats['total'] > 0:
@@ -158,9 +178,9 @@ def main():
         return
     
     print(f"\n📈 BY CATEGORY:")
-    for cat, cat_stats in category_stats.items():
-        accuracy = cat_stats['correct'] * 100 // cat_stats['total'] if cat_stats['total'] > 0 else 0
-        print(f"   {cat:<20}: {cat_stats['correct']}/{cat_stats['total']} ({accuracy}%)")
+    for cat, total in category_total.items():
+        accuracy = category_correct[cat] * 100 // total if total > 0 else 0
+        print(f"   {cat:<20}: {category_correct[cat]}/{total} ({accuracy}%)")
     print()
 
 if __name__ == "__main__":
@@ -12,6 +12,9 @@ from wordpress_api import WordPressAPI
 
 load_dotenv()
 
+_INTRO_RE = re.compile(r'<div class="acap-intro">(.*?)</div>', re.DOTALL)
+_DIV_CLASS_RE = re.compile(r'<div[^>]*class="([^"]*)"[^>]*>')
+
 wp = WordPressAPI(
     site_url=os.getenv('WP_SITE_URL'),
     username=os.getenv('WP_USERNAME'),
@@ -23,7 +26,12 @@ slug = "best-6-person-patio-dining-set"
 
 response = wp.session.get(
     f"{wp.api_base}/posts",
-    params={'slug': slug},
+    params={
+        'slug': slug,
+        'per_page': 1,  # Only posts[0] is used
+        '_fields': 'id,title.rendered,content.rendered',
+        'context': 'view'
+    },
     auth=wp.session.auth
 )
 
@@ -40,8 +48,7 @@ if response.status_code == 200:
         html = post['content']['rendered']
         
         # Find intro div
-        intro_pattern = r'<div class="acap-intro">(.*?)</div>'
-        intro_match = re.search(intro_pattern, html, re.DOTALL)
+        intro_match = _INTRO_RE.search(html)
         
         if intro_match:
             print("✅ Found intro div:")
@@ -53,7 +60,6 @@ if response.status_code == 200:
             print("\n...")
             
             # Try to find any div
-            div_pattern = r'<div[^>]*class="([^"]*)"[^>]*>'
-            divs = re.findall(div_pattern, html[:1000])
+            divs = _DIV_CLASS_RE.findall(html[:1000])
             if divs:
                 print(f"\nFound divs with classes: {divs[:5]}")
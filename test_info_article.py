@@ -5,10 +5,13 @@ Test keyword: "how to cook beef ribs"
 import sys
 import os
 import json
+try:
+    import orjson  # Optional: faster serialization for large article payloads
+except ImportError:
+    orjson = None
 from dotenv import load_dotenv
 from unified_ai_client import UnifiedAIClient
-from chat_zai_client import ChatZaiClient
-from cerebras_client import CerebrasClient
+from client_factory import get_chat_zai, get_cerebras
 from ai_generator import AIContentGenerator
 
 # Load environment
@@ -25,15 +28,8 @@ def test_info_article():
     
     # Initialize clients
     print("🔧 Initializing AI clients...")
-    chat_zai = ChatZaiClient(
-        api_url=os.getenv('CHAT_ZAI_API_URL', 'http://localhost:3001'),
-        timeout=60
-    )
-    
-    cerebras = CerebrasClient(
-        api_keys_file=os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt'),
-        model='zai-glm-4.6'
-    )
+    chat_zai = get_chat_zai(timeout=60)
+    cerebras = get_cerebras('zai-glm-4.6')
     
     ai_client = UnifiedAIClient(chat_zai_client=chat_zai, cerebras_client=cerebras)
     generator = AIContentGenerator(ai_client)
@@ -71,8 +67,12 @@ def test_info_article():
         
         # Save to file
         output_file = "test_info_article_output.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(article, f, indent=2, ensure_ascii=False)
+        if orjson:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(article, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(article, f, indent=2, ensure_ascii=False)
         print(f"💾 Full output saved to: {output_file}\n")
         
         return article
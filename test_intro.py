@@ -2,7 +2,7 @@
 """Test intro generation"""
 import os
 from dotenv import load_dotenv
-from cerebras_client import CerebrasClient
+from client_factory import get_cerebras
 from ai_generator import AIContentGenerator
 
 load_dotenv()
@@ -11,10 +11,7 @@ print("=" * 70)
 print("TESTING INTRO GENERATION (WITHOUT REASONING MODE)")
 print("=" * 70)
 
-cerebras = CerebrasClient(
-    api_keys_file=os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt'),
-    model=os.getenv('CEREBRAS_MODEL', 'gpt-oss-120b')
-)
+cerebras = get_cerebras(os.getenv('CEREBRAS_MODEL', 'gpt-oss-120b'))
 
 ai_gen = AIContentGenerator(cerebras)
 
@@ -2,7 +2,7 @@
 """Test intro generation 10 times and save to file"""
 import os
 from dotenv import load_dotenv
-from cerebras_client import CerebrasClient
+from client_factory import get_cerebras
 from ai_generator import AIContentGenerator
 
 load_dotenv()
@@ -11,61 +11,72 @@ print("=" * 70)
 print("TESTING INTRO GENERATION - 10 TIMES")
 print("=" * 70)
 
-cerebras = CerebrasClient(
-    api_keys_file=os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt'),
-    model=os.getenv('CEREBRAS_MODEL', 'gpt-oss-120b')
-)
+cerebras = get_cerebras(os.getenv('CEREBRAS_MODEL', 'gpt-oss-120b'))
 
 ai_gen = AIContentGenerator(cerebras)
 
 keyword = "best coffee maker"
-results = []
 
-for i in range(1, 11):
-    print(f"\n[{i}/10] Generating intro for '{keyword}'...")
-    try:
-        intro = ai_gen.generate_intro(keyword)
-        word_count = len(intro.split())
-        results.append({
+print(f"\nGenerating 10 intros for '{keyword}' in a single batched request...")
+# Same prompt 10 times: one request with n=10 instead of 10 round-trips
+try:
+    intros = ai_gen.generate_intros_batch(keyword, n=10)
+    results = [
+        {
             'run': i,
             'intro': intro,
-            'word_count': word_count,
+            'word_count': len(intro.split()),
             'success': True
-        })
-        print(f"  ✅ Success ({word_count} words)")
-    except Exception as e:
-        results.append({
+        } if intro else {
             'run': i,
             'intro': '',
-            'error': str(e),
+            'error': 'Empty completion',
             'success': False
-        })
-        print(f"  ❌ Error: {e}")
+        }
+        for i, intro in enumerate(intros, 1)
+    ]
+except Exception as e:
+    print(f"  ❌ Error: {e}")
+    results = [
+        {'run': i, 'intro': '', 'error': str(e), 'success': False}
+        for i in range(1, 11)
+    ]
+
+for result in results:
+    if result['success']:
+        print(f"  [{result['run']}/10] ✅ Success ({result['word_count']} words)")
+    else:
+        print(f"  [{result['run']}/10] ❌ Error: {result['error']}")
+
+# Build the report in memory, then write it in one call
+parts = [
+    "=" * 70 + "\n",
+    "INTRO GENERATION TEST - 10 RUNS\n",
+    f"Keyword: {keyword}\n",
+    "=" * 70 + "\n\n",
+]
+
+for result in results:
+    parts.append(f"{'='*70}\n")
+    parts.append(f"RUN #{result['run']}\n")
+    parts.append(f"{'='*70}\n")
+    
+    if result['success']:
+        parts.append(f"Status: SUCCESS\n")
+        parts.append(f"Word Count: {result['word_count']}\n")
+        parts.append(f"Length: {len(result['intro'])} characters\n")
+        parts.append(f"\nIntro Text:\n")
+        parts.append("-" * 70 + "\n")
+        parts.append(f"{result['intro']}\n")
+        parts.append("-" * 70 + "\n\n")
+    else:
+        parts.append(f"Status: FAILED\n")
+        parts.append(f"Error: {result['error']}\n\n")
 
 # Save to file
 output_file = "intro_test_results.txt"
 with open(output_file, 'w', encoding='utf-8') as f:
-    f.write("=" * 70 + "\n")
-    f.write("INTRO GENERATION TEST - 10 RUNS\n")
-    f.write(f"Keyword: {keyword}\n")
-    f.write("=" * 70 + "\n\n")
-    
-    for result in results:
-        f.write(f"{'='*70}\n")
-        f.write(f"RUN #{result['run']}\n")
-        f.write(f"{'='*70}\n")
-        
-        if result['success']:
-            f.write(f"Status: SUCCESS\n")
-            f.write(f"Word Count: {result['word_count']}\n")
-            f.write(f"Length: {len(result['intro'])} characters\n")
-            f.write(f"\nIntro Text:\n")
-            f.write("-" * 70 + "\n")
-            f.write(f"{result['intro']}\n")
-            f.write("-" * 70 + "\n\n")
-        else:
-            f.write(f"Status: FAILED\n")
-            f.write(f"Error: {result['error']}\n\n")
+    f.write(''.join(parts))
 
 # Summary
 success_count = sum(1 for r in results if r['success'])
@@ -2,7 +2,7 @@
 """Quick test intro with llama-3.3-70b"""
 import os
 from dotenv import load_dotenv
-from cerebras_client import CerebrasClient
+from client_factory import get_cerebras
 from ai_generator import AIContentGenerator
 
 load_dotenv()
@@ -11,10 +11,7 @@ print("=" * 70)
 print("TESTING INTRO WITH LLAMA-3.3-70B")
 print("=" * 70)
 
-cerebras = CerebrasClient(
-    api_keys_file=os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt'),
-    model=os.getenv('CEREBRAS_MODEL', 'gpt-oss-120b')  # Default for other tasks
-)
+cerebras = get_cerebras(os.getenv('CEREBRAS_MODEL', 'gpt-oss-120b'))  # Default for other tasks
 
 ai_gen = AIContentGenerator(cerebras)
 
@@ -7,6 +7,10 @@ print("=" * 70)
 print("TESTING CEREBRAS KEY CACHING")
 print("=" * 70)
 
+# Parse the keys file once and share it across all clients below
+with open('cerebras_api_keys.txt', 'r') as f:
+    KEYS = tuple(line.strip() for line in f if line.strip() and not line.startswith('#'))
+
 # Clean cache first
 cache_file = "cerebras_key_cache.txt"
 if os.path.exists(cache_file):
@@ -15,10 +19,7 @@ if os.path.exists(cache_file):
 
 # Test 1: First initialization (no cache)
 print("\n[TEST 1] First initialization (no cache)")
-client1 = CerebrasClient(
-    api_keys_file='cerebras_api_keys.txt',
-    model='gpt-oss-120b'
-)
+client1 = CerebrasClient.from_keys(KEYS, 'gpt-oss-120b')
 print(f"   Current key index: #{client1.key_index}")
 print(f"   Cache file exists: {os.path.exists(cache_file)}")
 
@@ -29,10 +30,7 @@ if os.path.exists(cache_file):
 
 # Test 2: Second initialization (should load from cache)
 print("\n[TEST 2] Second initialization (should load cached key)")
-client2 = CerebrasClient(
-    api_keys_file='cerebras_api_keys.txt',
-    model='gpt-oss-120b'
-)
+client2 = CerebrasClient.from_keys(KEYS, 'gpt-oss-120b')
 print(f"   Current key index: #{client2.key_index}")
 
 # Test 3: Generate content (should update cache)
@@ -5,6 +5,10 @@ Keyword: "how to cook beef ribs"
 """
 import sys
 import json
+try:
+    import orjson  # Optional: faster (de)serialization for large article payloads
+except ImportError:
+    orjson = None
 from dotenv import load_dotenv
 from wordpress_api import WordPressAPI
 from html_builder import HTMLBuilder
@@ -22,8 +26,12 @@ def test_post_info():
     
     # Load generated content
     print("📂 Loading generated content...")
-    with open('test_info_article_output.json', 'r', encoding='utf-8') as f:
-        article_data = json.load(f)
+    if orjson:
+        with open('test_info_article_output.json', 'rb') as f:
+            article_data = orjson.loads(f.read())
+    else:
+        with open('test_info_article_output.json', 'r', encoding='utf-8') as f:
+            article_data = json.load(f)
     
     keyword = "how to cook beef ribs"
     print(f"Keyword: {keyword}")
@@ -88,8 +96,12 @@ def test_post_info():
         print()
         
         # Save result
-        with open('test_info_post_result.json', 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        if orjson:
+            with open('test_info_post_result.json', 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+        else:
+            with open('test_info_post_result.json', 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
         print("💾 Full result saved to: test_info_post_result.json\n")
         
     except Exception as e:
@@ -4,9 +4,19 @@ Simple test for ChatZai API
 """
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_URL = "http://localhost:3001"
 
+# One keep-alive session for both calls instead of a new connection per request
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.1)
+))
+
 print("\n" + "="*60)
 print("Simple ChatZai API Test")
 print("="*60)
@@ -14,7 +24,7 @@ print("="*60)
 # Test 1: Health Check
 print("\n1. Health Check...")
 try:
-    response = requests.get(f"{API_URL}/health", timeout=5)
+    response = _SESSION.get(f"{API_URL}/health", timeout=5)
     print(f"   Status: {response.status_code}")
     print(f"   Response: {response.text}")
 except Exception as e:
@@ -28,7 +38,7 @@ payload = {
 }
 
 try:
-    response = requests.post(f"{API_URL}/ask", json=payload, timeout=30)
+    response = _SESSION.post(f"{API_URL}/ask", json=payload, timeout=30)
     print(f"   Status: {response.status_code}")
     data = response.json()
     print(f"   Response keys: {list(data.keys())}")
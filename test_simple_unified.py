@@ -4,8 +4,7 @@ Simple test for Unified AI Client
 """
 import os
 from dotenv import load_dotenv
-from chat_zai_client import ChatZaiClient
-from cerebras_client import CerebrasClient
+from client_factory import get_chat_zai, get_cerebras
 from unified_ai_client import UnifiedAIClient
 
 load_dotenv()
@@ -16,15 +15,8 @@ print("="*60)
 
 # Initialize clients
 print("\nInitializing clients...")
-chat_zai = ChatZaiClient(
-    api_url=os.getenv('CHAT_ZAI_API_URL', 'http://localhost:3001'),
-    timeout=30
-)
-
-cerebras = CerebrasClient(
-    api_keys_file=os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt'),
-    model=os.getenv('CEREBRAS_MODEL', 'llama3.1-8b')
-)
+chat_zai = get_chat_zai(timeout=30)
+cerebras = get_cerebras(os.getenv('CEREBRAS_MODEL', 'llama3.1-8b'))
 
 unified = UnifiedAIClient(chat_zai, cerebras)
 
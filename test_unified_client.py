@@ -3,10 +3,10 @@
 Test script for Unified AI Client
 Tests ChatZai and Cerebras integration with fallback logic
 """
+import asyncio
 import os
 from dotenv import load_dotenv
-from chat_zai_client import ChatZaiClient
-from cerebras_client import CerebrasClient
+from client_factory import get_chat_zai, get_cerebras
 from unified_ai_client import UnifiedAIClient
 
 def test_chat_zai_only():
@@ -15,7 +15,7 @@ def test_chat_zai_only():
     print("TEST 1: ChatZai Client Only")
     print("="*60)
     
-    client = ChatZaiClient(api_url=os.getenv('CHAT_ZAI_API_URL', 'http://localhost:3001'))
+    client = get_chat_zai()
     
     # Health check
     print("\n1. Health Check...")
@@ -50,11 +50,8 @@ def test_unified_client():
     load_dotenv()
     
     # Initialize clients
-    chat_zai = ChatZaiClient(api_url=os.getenv('CHAT_ZAI_API_URL', 'http://localhost:3001'))
-    cerebras = CerebrasClient(
-        api_keys_file=os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt'),
-        model=os.getenv('CEREBRAS_MODEL', 'llama3.1-8b')
-    )
+    chat_zai = get_chat_zai()
+    cerebras = get_cerebras(os.getenv('CEREBRAS_MODEL', 'llama3.1-8b'))
     
     unified = UnifiedAIClient(chat_zai, cerebras)
     
@@ -87,11 +84,8 @@ def test_multiple_requests():
     load_dotenv()
     
     # Initialize clients
-    chat_zai = ChatZaiClient(api_url=os.getenv('CHAT_ZAI_API_URL', 'http://localhost:3001'))
-    cerebras = CerebrasClient(
-        api_keys_file=os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt'),
-        model=os.getenv('CEREBRAS_MODEL', 'llama3.1-8b')
-    )
+    chat_zai = get_chat_zai()
+    cerebras = get_cerebras(os.getenv('CEREBRAS_MODEL', 'llama3.1-8b'))
     
     unified = UnifiedAIClient(chat_zai, cerebras)
     
@@ -103,13 +97,24 @@ def test_multiple_requests():
     
     print(f"\nTesting {len(prompts)} requests...\n")
     
-    for i, prompt in enumerate(prompts, 1):
-        print(f"Request {i}/{len(prompts)}: {prompt}...")
+    async def run_all():
+        # Fire all prompts at once: wall time is one round-trip instead of N
         try:
-            response = unified.generate(prompt, max_tokens=50)
+            return await asyncio.gather(
+                *(unified.agenerate(prompt, max_tokens=50) for prompt in prompts),
+                return_exceptions=True
+            )
+        finally:
+            await unified.aclose()
+    
+    results = asyncio.run(run_all())
+    
+    for i, (prompt, response) in enumerate(zip(prompts, results), 1):
+        print(f"Request {i}/{len(prompts)}: {prompt}...")
+        if isinstance(response, Exception):
+            print(f"   ✗ Failed: {response}")
+        else:
             print(f"   ✓ Success ({len(response)} chars)")
-        except Exception as e:
-            print(f"   ✗ Failed: {e}")
     
     # Final statistics
     print("\n" + "="*60)
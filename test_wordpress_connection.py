@@ -1,22 +1,32 @@
 #!/usr/bin/env python3
 """
-Test WordPress connection
+Test WordPress connection for every site in sites_config.json
+Sites are probed in parallel, so total time is the slowest site, not the sum
 """
+from concurrent.futures import ThreadPoolExecutor
 from wordpress_api import WordPressAPI
+from site_config import SiteConfigManager
+
+
+def probe(site):
+    """Run test_connection() against one site"""
+    wp = WordPressAPI(
+        site_url=site.site_url,
+        username=site.username,
+        app_password=site.app_password
+    )
+    return site.name, wp.test_connection()
+
 
 print("\n" + "="*60)
 print("WordPress Connection Test")
 print("="*60)
 
-# Test MountainTidesWine
-print("\nTesting MountainTidesWine...")
-wp = WordPressAPI(
-    site_url="https://www.mountaintideswine.com",
-    username="admin",
-    app_password="IFJ5 sDd8 AFQe Z9cq BGmi 84bD"
-)
+sites = SiteConfigManager('sites_config.json').list_sites()
+print(f"\nTesting {len(sites)} site(s)...")
 
-result = wp.test_connection()
-print(f"Result: {'✓ Success' if result else '✗ Failed'}")
+with ThreadPoolExecutor(max_workers=len(sites)) as executor:
+    for name, result in executor.map(probe, sites):
+        print(f"{name}: {'✓ Success' if result else '✗ Failed'}")
 
 print("\n" + "="*60 + "\n")
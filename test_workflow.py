@@ -2,12 +2,36 @@
 """
 Test script to validate the entire workflow
 """
+import io
 import os
 import sys
-from dotenv import load_dotenv
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# Load environment
-load_dotenv()
+# Environment snapshot shared by all tests; filled by main() after .env is loaded
+_ENV = {}
+
+class _ThreadBufferedStdout:
+    """sys.stdout proxy that captures prints per thread so parallel tests don't interleave"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buf = getattr(self._local, 'buf', None)
+        return (buf if buf is not None else self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def run_buffered(self, func):
+        """Run func with this thread's prints captured; returns (result, output)"""
+        self._local.buf = io.StringIO()
+        try:
+            return func(), self._local.buf.getvalue()
+        finally:
+            self._local.buf = None
 
 def test_env_config():
     """Test environment configuration"""
@@ -24,7 +48,7 @@ def test_env_config():
     
     missing = []
     for var, desc in required_vars.items():
-        value = os.getenv(var)
+        value = _ENV.get(var)
         if not value:
             print(f"  ❌ Missing: {var} ({desc})")
             missing.append(var)
@@ -33,9 +57,9 @@ def test_env_config():
     
     # Check numeric values
     try:
-        author_id = int(os.getenv('POST_AUTHOR_ID', '0'))
-        category_id = int(os.getenv('POST_CATEGORY_ID', '0'))
-        delay = int(os.getenv('POST_DELAY_SECONDS', '12'))
+        author_id = int(_ENV.get('POST_AUTHOR_ID', '0'))
+        category_id = int(_ENV.get('POST_CATEGORY_ID', '0'))
+        delay = int(_ENV.get('POST_DELAY_SECONDS', '12'))
         print(f"  ✅ POST_AUTHOR_ID: {author_id}")
         print(f"  ✅ POST_CATEGORY_ID: {category_id}")
         print(f"  ✅ POST_DELAY_SECONDS: {delay}")
@@ -54,25 +78,33 @@ def test_cerebras_keys():
     """Test Cerebras API keys file"""
     print("🔍 Testing Cerebras API keys...")
     
-    keys_file = os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt')
+    keys_file = _ENV.get('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt')
     
     if not os.path.exists(keys_file):
         print(f"  ❌ File not found: {keys_file}")
         return False
     
+    # Single pass: count every key but only keep the ones we preview
+    preview, count = [], 0
     with open(keys_file, 'r', encoding='utf-8') as f:
-        keys = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-    
-    if not keys:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            count += 1
+            if len(preview) < 3:
+                preview.append(line)
+    
+    if not count:
         print(f"  ❌ No API keys found in {keys_file}")
         return False
     
-    print(f"  ✅ Found {len(keys)} API key(s)")
-    for i, key in enumerate(keys[:3], 1):
+    print(f"  ✅ Found {count} API key(s)")
+    for i, key in enumerate(preview, 1):
         print(f"     Key #{i}: {key[:10]}...{key[-10:]}")
     
-    if len(keys) > 3:
-        print(f"     ... and {len(keys) - 3} more")
+    if count > 3:
+        print(f"     ... and {count - 3} more")
     
     print("✅ Cerebras API keys OK\n")
     return True
@@ -85,19 +117,27 @@ def test_keywords():
         print("  ❌ keywords.txt not found")
         return False
     
+    # Single pass: count every keyword but only keep the ones we preview
+    preview, count = [], 0
     with open('keywords.txt', 'r', encoding='utf-8') as f:
-        keywords = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-    
-    if not keywords:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            count += 1
+            if len(preview) < 5:
+                preview.append(line)
+    
+    if not count:
         print("  ❌ No keywords found")
         return False
     
-    print(f"  ✅ Found {len(keywords)} keyword(s)")
-    for kw in keywords[:5]:
+    print(f"  ✅ Found {count} keyword(s)")
+    for kw in preview:
         print(f"     - {kw}")
     
-    if len(keywords) > 5:
-        print(f"     ... and {len(keywords) - 5} more")
+    if count > 5:
+        print(f"     ... and {count - 5} more")
     
     print("✅ Keywords OK\n")
     return True
@@ -109,8 +149,8 @@ def test_cerebras_client():
     try:
         from cerebras_client import CerebrasClient
         
-        keys_file = os.getenv('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt')
-        model = os.getenv('CEREBRAS_MODEL', 'gpt-oss-120b')
+        keys_file = _ENV.get('CEREBRAS_KEYS_FILE', 'cerebras_api_keys.txt')
+        model = _ENV.get('CEREBRAS_MODEL', 'gpt-oss-120b')
         
         client = CerebrasClient(api_keys_file=keys_file, model=model)
         print(f"  ✅ Client initialized with model: {model}")
@@ -130,10 +170,10 @@ def test_amazon_api():
         from amazon_api import AmazonProductAPI
         
         api = AmazonProductAPI(
-            access_key=os.getenv('AMAZON_ACCESS_KEY'),
-            secret_key=os.getenv('AMAZON_SECRET_KEY'),
-            partner_tag=os.getenv('AMAZON_PARTNER_TAG'),
-            region=os.getenv('AMAZON_REGION', 'us-east-1')
+            access_key=_ENV.get('AMAZON_ACCESS_KEY'),
+            secret_key=_ENV.get('AMAZON_SECRET_KEY'),
+            partner_tag=_ENV.get('AMAZON_PARTNER_TAG'),
+            region=_ENV.get('AMAZON_REGION', 'us-east-1')
         )
         print(f"  ✅ Amazon API initialized for region: {api.country}")
         print("✅ Amazon API OK\n")
@@ -151,9 +191,9 @@ def test_wordpress_api():
         from wordpress_api import WordPressAPI
         
         wp = WordPressAPI(
-            site_url=os.getenv('WP_SITE_URL'),
-            username=os.getenv('WP_USERNAME'),
-            app_password=os.getenv('WP_APP_PASSWORD')
+            site_url=_ENV.get('WP_SITE_URL'),
+            username=_ENV.get('WP_USERNAME'),
+            app_password=_ENV.get('WP_APP_PASSWORD')
         )
         
         if wp.test_connection():
@@ -194,6 +234,11 @@ def test_ai_generation(cerebras_client):
 
 def main():
     """Run all tests"""
+    # Load environment here (not at import) so importing this module costs nothing
+    from dotenv import load_dotenv
+    load_dotenv()
+    _ENV.update(os.environ)
+    
     print("""
 ╔═══════════════════════════════════════════════════════════╗
 ║  Amazon WP Poster - Workflow Test                        ║
@@ -208,23 +253,43 @@ def main():
         print("⚠️  Fix .env file before continuing\n")
         return False
     
-    # Test 2: Cerebras keys
-    results['cerebras_keys'] = test_cerebras_keys()
-    
-    # Test 3: Keywords
-    results['keywords'] = test_keywords()
-    
-    # Test 4: Cerebras client
-    cerebras_ok, cerebras_client = test_cerebras_client()
-    results['cerebras_client'] = cerebras_ok
-    
-    # Test 5: Amazon API
-    amazon_ok, amazon_api = test_amazon_api()
-    results['amazon_api'] = amazon_ok
-    
-    # Test 6: WordPress API
-    wp_ok, wp_api = test_wordpress_api()
-    results['wordpress_api'] = wp_ok
+    # Modules call logging.basicConfig at import and the first call wins; import
+    # cerebras_client (DEBUG) here, as the serial order did, so the root level
+    # doesn't depend on which worker thread imports amazon_api/wordpress_api first
+    try:
+        import cerebras_client  # noqa: F401
+    except ImportError:
+        pass  # Reported by test_cerebras_client
+    
+    # Tests 2-6 are independent: run the file/network checks in parallel while
+    # the Cerebras client initializes here. Output is buffered per test and
+    # printed in the usual order once everything is done.
+    stdout = _ThreadBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                name: executor.submit(stdout.run_buffered, func)
+                for name, func in (
+                    ('cerebras_keys', test_cerebras_keys),
+                    ('keywords', test_keywords),
+                    ('amazon_api', test_amazon_api),
+                    ('wordpress_api', test_wordpress_api),
+                )
+            }
+            cerebras_result = stdout.run_buffered(test_cerebras_client)
+            outputs = {name: future.result() for name, future in futures.items()}
+    finally:
+        sys.stdout = stdout._stream
+    
+    outputs['cerebras_client'] = cerebras_result
+    for name in ('cerebras_keys', 'keywords', 'cerebras_client', 'amazon_api', 'wordpress_api'):
+        result, output = outputs[name]
+        print(output, end='')
+        # Client tests return (ok, client); file checks return ok
+        results[name] = result[0] if isinstance(result, tuple) else result
+    
+    cerebras_ok, cerebras_client = outputs['cerebras_client'][0]
     
     # Test 7: AI Generation (only if Cerebras client OK)
     if cerebras_ok and cerebras_client:
@@ -2,11 +2,39 @@
 """
 Debug script to test ChatZai API response format
 """
+import atexit
 import requests
-import json
+from requests.adapters import HTTPAdapter
 
 API_URL = "http://localhost:3001"
 
+# One pooled keep-alive session for every request in this script
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+atexit.register(SESSION.close)
+
+def json_span(s, pos=0):
+    """Return (start, end) of the first balanced {...} object in s at or after pos, or (-1, -1)
+    
+    One forward pass instead of find('{') + rfind('}'); braces inside
+    JSON strings are not special-cased, which is fine for this debug output.
+    Also used by tmp_rovodev_see_full_badge_response.
+    """
+    start = -1
+    depth = 0
+    for i in range(pos, len(s)):
+        c = s[i]
+        if c == '{':
+            if start < 0:
+                start = i
+            depth += 1
+        elif c == '}' and start >= 0:
+            depth -= 1
+            if depth == 0:
+                return start, i + 1
+    return -1, -1
+
 def test_simple_json_request():
     """Test if API returns only the answer or includes the prompt"""
     print("="*70)
@@ -19,7 +47,7 @@ def test_simple_json_request():
     print(f"\n📤 Sending prompt ({len(prompt)} chars):")
     print(f"'{prompt}'")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{API_URL}/ask",
         json={"prompt": prompt},
         timeout=30
@@ -32,12 +60,17 @@ def test_simple_json_request():
     print(f"'{answer}'")
     
     # Check if prompt is included in answer
-    if prompt in answer:
+    # Cheap rejects first: an echo needs room for the whole prompt and must contain its opening
+    prompt_pos = -1
+    if len(answer) >= len(prompt) and answer.find(prompt[:32]) != -1:
+        prompt_pos = answer.find(prompt)
+    
+    if prompt_pos != -1:
         print("\n❌ PROBLEM: API is returning the PROMPT inside the answer!")
         print("   This causes JSON parsing to fail.")
         
         # Find where actual answer starts
-        prompt_end = answer.find(prompt) + len(prompt)
+        prompt_end = prompt_pos + len(prompt)
         actual_answer = answer[prompt_end:].strip()
         print(f"\n📝 Actual answer after prompt ({len(actual_answer)} chars):")
         print(f"'{actual_answer[:200]}'...")
@@ -48,6 +81,8 @@ def test_simple_json_request():
 
 def test_json_generation():
     """Test JSON generation like badges"""
+    import json  # Only this test parses JSON
+    
     print("\n" + "="*70)
     print("TEST 2: JSON Generation (like badges)")
     print("="*70)
@@ -65,7 +100,7 @@ Products:
     
     print(f"\n📤 Sending prompt ({len(prompt)} chars)")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{API_URL}/ask",
         json={"prompt": prompt},
         timeout=30
@@ -85,12 +120,19 @@ Products:
     if answer.startswith("IMPORTANT: Output ONLY"):
         print("❌ Response starts with the prompt!")
         
-        # Try to extract JSON after prompt
+        # Try to extract JSON after prompt; the echoed prompt's own
+        # JSON FORMAT template must not count as the answer
         try:
-            json_start = answer.find('{')
-            json_end = answer.rfind('}') + 1
+            if answer.startswith(prompt):
+                offset = len(prompt)
+            else:
+                offset = 0
+                print("⚠️ Echo differs from the prompt, scanning from the start (may hit the template)")
+            json_start, json_end = json_span(answer, offset)
             
-            if json_start != -1 and json_end > json_start:
+            if json_start == -1:
+                print("❌ No JSON object found after the echoed prompt!")
+            else:
                 extracted = answer[json_start:json_end]
                 print(f"\n📦 Extracted JSON ({len(extracted)} chars):")
                 print(extracted[:200] + "..." if len(extracted) > 200 else extracted)
@@ -128,7 +170,7 @@ Create this JSON: {"status": "ok", "message": "test"}'''
     
     print(f"\n📤 Sending prompt with system-style instruction")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{API_URL}/ask",
         json={"prompt": prompt},
         timeout=30
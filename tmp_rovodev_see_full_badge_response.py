@@ -2,11 +2,21 @@
 """
 See full response from ChatZai for badge generation
 """
+import atexit
+import io
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from tmp_rovodev_debug_response import json_span
 
 API_URL = "http://localhost:3001"
 
+# One pooled keep-alive session for every request in this script
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+atexit.register(SESSION.close)
+
 # Sample products (like real workflow)
 products = [
     {
@@ -27,22 +37,28 @@ products = [
 
 keyword = "the best slow cooker roast"
 
-# Build compact list
-compact = []
-all_asins = []
-for product in products:
+# Build compact product JSON straight into a buffer (no intermediate list of dicts)
+buf = io.StringIO()
+buf.write('[')
+for i, product in enumerate(products):
     title = product['title']
     if len(title) > 80:
         title = title[:77] + '…'
     
-    compact.append({
+    if i:
+        buf.write(', ')
+    json.dump({
         'asin': product['asin'],
         'title': title,
         'price': product['price'],
         'brand': product.get('brand', ''),
-        'features': product['features'] if product['features'] else []
-    })
-    all_asins.append(product['asin'])
+        'features': product['features'] or []
+    }, buf, ensure_ascii=False)
+buf.write(']')
+compact_json = buf.getvalue()
+
+all_asins = [product['asin'] for product in products]
+asins_str = ', '.join(all_asins)
 
 # Build prompt (EXACTLY like ai_generator.py)
 prompt = (
@@ -55,13 +71,13 @@ prompt = (
     "4. Pick exactly ONE product as top recommendation (editor's choice)\n"
     "5. Draw inspiration from the brand, title, and feature list for each product when crafting the badge\n"
     "6. Examples of acceptable style: \"Rain-Ready Seating\", \"Compact Bistro Choice\", \"Premium Teak Craft\", \"Budget-Friendly Lounger\"\n\n"
-    f"MANDATORY: Return badges for ALL {len(compact)} products.\n\n"
+    f"MANDATORY: Return badges for ALL {len(products)} products.\n\n"
     "JSON FORMAT (no markdown, no extra text):\n"
     '{"top_recommendation": {"asin": "ACTUAL_ASIN"}, "badges": ['
     '{"asin": "ASIN1", "badge": "Best overall"}, {"asin": "ASIN2", "badge": "Best value"}, ...]}\n\n'
-    f"ALL ASINs that MUST be included:\n{', '.join(all_asins)}\n\n"
+    f"ALL ASINs that MUST be included:\n{asins_str}\n\n"
     f"Context: {keyword}\n"
-    f"Products: {json.dumps(compact, ensure_ascii=False)}"
+    f"Products: {compact_json}"
 )
 
 print("="*80)
@@ -78,7 +94,7 @@ print("\n" + "="*80)
 print("SENDING TO API...")
 print("="*80)
 
-response = requests.post(
+response = SESSION.post(
     f"{API_URL}/ask",
     json={"prompt": prompt},
     timeout=60
@@ -106,12 +122,12 @@ print("="*80)
 if answer.startswith("IMPORTANT: Output ONLY"):
     print("❌ Response STARTS with the prompt text!")
     
-    # Find first {
-    json_start = answer.find('{')
+    # Find first balanced {...}
+    json_start, json_end = json_span(answer)
     if json_start == -1:
         print("❌ No JSON object found in response!")
     else:
-        print(f"✅ JSON object found at position {json_start}")
+        print(f"✅ JSON object found at position {json_start} ({json_end - json_start} chars)")
         print(f"   Text before JSON: '{answer[:json_start]}'")
         
         # Check if it's part of the prompt
@@ -129,15 +145,8 @@ else:
         print(f"⚠️ Response starts with: '{answer[:100]}'")
 
 # Save to file for inspection
+payload = "\n".join(["="*80, "PROMPT:", "="*80, prompt, "", "="*80, "RESPONSE:", "="*80, answer])
 with open('tmp_rovodev_badge_response.txt', 'w', encoding='utf-8') as f:
-    f.write("="*80 + "\n")
-    f.write("PROMPT:\n")
-    f.write("="*80 + "\n")
-    f.write(prompt)
-    f.write("\n\n")
-    f.write("="*80 + "\n")
-    f.write("RESPONSE:\n")
-    f.write("="*80 + "\n")
-    f.write(answer)
+    f.write(payload)
 
 print(f"\n💾 Full response saved to: tmp_rovodev_badge_response.txt")
@@ -1,53 +1,195 @@
 """
 Unified AI Client - Manages multiple AI providers with smart fallback
 """
+import asyncio
 import logging
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+import requests
 from chat_zai_client import ChatZaiClient
 from cerebras_client import CerebrasClient
 
 logger = logging.getLogger(__name__)
 
+# Answer prefix some ChatZai workers prepend ("Here is your answer:")
+_ANSWER_PREFIX_RE = re.compile(r'here\s+is\s+your\s+answer[:\s]*', re.IGNORECASE)
+
+
+class _Stats:
+    """Provider usage counters (mutate only while holding UnifiedAIClient._stats_lock)"""
+    
+    __slots__ = ('chat_zai_success', 'chat_zai_failed', 'cerebras_success', 'cerebras_failed', 'total_requests')
+    
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+    
+    def _asdict(self) -> dict:
+        """Counters as a dict, in declaration order"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class UnifiedAIClient:
     """Unified client that manages ChatZai (primary) and Cerebras (fallback)"""
     
-    def __init__(self, chat_zai_client: ChatZaiClient, cerebras_client: CerebrasClient):
+    # Fixed attribute layout (no per-instance __dict__)
+    __slots__ = (
+        'chat_zai', 'cerebras', 'chat_zai_healthy', '_health_ttl', '_last_health_probe_ts',
+        'stats', '_stats_lock', '_stats_dirty', '_stats_cache', '_breaker', '_breaker_lock'
+    )
+    
+    # Circuit breaker: after FAIL_THRESHOLD consecutive ChatZai failures, skip it
+    # for OPEN_SECONDS, then let a single half-open probe decide whether to close
+    FAIL_THRESHOLD = 5
+    OPEN_SECONDS = 30
+    
+    def __init__(self, chat_zai_client: ChatZaiClient, cerebras_client: CerebrasClient,
+                 eager_health: bool = True, shared_session: Optional[requests.Session] = None):
         """
         Initialize unified client with both providers
         
         Args:
             chat_zai_client: ChatZai API client (primary)
             cerebras_client: Cerebras API client (fallback)
+            eager_health: Probe ChatZai health now; if False the probe is deferred
+                to the first generate() call (chat_zai_healthy stays None until then)
+            shared_session: Optional requests.Session (one connection pool) injected into
+                every provider client that talks HTTP through a `session` attribute
         """
         self.chat_zai = chat_zai_client
         self.cerebras = cerebras_client
         
-        # Stats tracking
-        self.stats = {
-            'chat_zai_success': 0,
-            'chat_zai_failed': 0,
-            'cerebras_success': 0,
-            'cerebras_failed': 0,
-            'total_requests': 0
-        }
+        # Cerebras goes through its SDK's own HTTP client, so in practice this is ChatZai
+        if shared_session is not None:
+            for client in (chat_zai_client, cerebras_client):
+                if isinstance(getattr(client, 'session', None), requests.Session):
+                    if client.session is not shared_session:
+                        client.session.close()
+                    client.session = shared_session
+        
+        # Stats tracking (counters are shared by generate_many() worker threads)
+        self._stats_lock = threading.Lock()
+        self.stats = _Stats()
+        
+        # get_stats() snapshot, rebuilt only after a counter (or health) changes
+        self._stats_dirty = True
+        self._stats_cache = None
+        
+        # ChatZai circuit breaker state
+        self._breaker = {'fail_count': 0, 'opened_at': 0.0, 'state': 'closed'}
+        self._breaker_lock = threading.Lock()
+        
+        # Health probe results are reused for _health_ttl seconds (None = not probed yet)
+        self.chat_zai_healthy = None
+        self._health_ttl = 30.0
+        self._last_health_probe_ts = None
         
         # Check initial health
-        self.chat_zai_healthy = self.chat_zai.health_check()
+        if eager_health:
+            self._probe_initial_health()
+    
+    def _probe_initial_health(self):
+        """Run the first ChatZai health probe and log the result"""
+        self.refresh_chat_zai_health()
         if self.chat_zai_healthy:
             logger.info("✓ ChatZai API is healthy and ready")
         else:
             logger.warning("✗ ChatZai API is not responding, will use Cerebras fallback")
     
+    def refresh_chat_zai_health(self) -> bool:
+        """
+        Re-probe ChatZai health, at most once per _health_ttl seconds
+        
+        Returns:
+            bool: Current (possibly cached) ChatZai health
+        """
+        now = time.monotonic()
+        if self._last_health_probe_ts is None or now - self._last_health_probe_ts > self._health_ttl:
+            self.chat_zai_healthy = self.chat_zai.health_check()
+            self._last_health_probe_ts = now
+        return self.chat_zai_healthy
+    
+    def _chat_zai_allowed(self) -> bool:
+        """Check the circuit breaker: may this request go to ChatZai?"""
+        with self._breaker_lock:
+            breaker = self._breaker
+            if breaker['state'] == 'closed':
+                return True
+            if breaker['state'] == 'open' and time.monotonic() - breaker['opened_at'] >= self.OPEN_SECONDS:
+                # Cool-down over: this request is the single half-open probe
+                breaker['state'] = 'half_open'
+                return True
+            return False
+    
+    def _mark_chat_zai_failed(self):
+        """Record a ChatZai failure and force a fresh health probe next time"""
+        with self._stats_lock:
+            self.stats.chat_zai_failed += 1
+            self._stats_dirty = True
+        self.chat_zai_healthy = False
+        self._last_health_probe_ts = None
+        
+        with self._breaker_lock:
+            breaker = self._breaker
+            breaker['fail_count'] += 1
+            if breaker['state'] == 'half_open' or breaker['fail_count'] >= self.FAIL_THRESHOLD:
+                if breaker['state'] != 'open':
+                    logger.warning("⚡ ChatZai circuit opened after %d failures, using Cerebras for %ds",
+                                   breaker['fail_count'], self.OPEN_SECONDS)
+                breaker['state'] = 'open'
+                breaker['opened_at'] = time.monotonic()
+    
+    def _generate_cerebras(self, prompt: str, system_prompt: Optional[str] = None,
+                           max_tokens: int = 4000, temperature: float = 0.7,
+                           stream: bool = False, use_reasoning: bool = True,
+                           model_override: Optional[str] = None) -> str:
+        """Serve a request from Cerebras, recording its stats"""
+        try:
+            response = self.cerebras.generate(
+                prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=stream,
+                use_reasoning=use_reasoning,
+                model_override=model_override,
+                system_prompt=system_prompt
+            )
+        except Exception as e:
+            logger.error("✗ Cerebras failed: %s", e)
+            with self._stats_lock:
+                self.stats.cerebras_failed += 1
+                self._stats_dirty = True
+            raise
+        
+        with self._stats_lock:
+            self.stats.cerebras_success += 1
+            self._stats_dirty = True
+        logger.info("✓ Cerebras generation successful")
+        
+        # See if ChatZai is back (at most one /health probe per _health_ttl during
+        # a fallback burst); if so, end the breaker cool-down so the next request
+        # is the half-open probe instead of waiting out OPEN_SECONDS
+        if self.refresh_chat_zai_health():
+            with self._breaker_lock:
+                if self._breaker['state'] == 'open':
+                    self._breaker['opened_at'] = time.monotonic() - self.OPEN_SECONDS
+        
+        return self._parse_response(response)
+    
     def _parse_response(self, text: str) -> str:
         """Parse response and remove 'Here is your answer' prefix"""
-        import re
-        # Case-insensitive search for "Here is your answer"
-        match = re.search(r'here\s+is\s+your\s+answer[:\s]*', text, re.IGNORECASE)
+        stripped = text.lstrip()
+        # Most answers have no prefix: a 4-char compare skips the regex entirely
+        if stripped[:4].lower() != 'here':
+            return stripped.rstrip()
+        # Anchored, case-insensitive match for "Here is your answer" (any whitespace)
+        match = _ANSWER_PREFIX_RE.match(stripped)
         if match:
-            return text[match.end():].strip()
-        return text.strip()
+            return stripped[match.end():].strip()
+        return stripped.rstrip()
     
     def generate(self, prompt: str, system_prompt: Optional[str] = None,
                  max_tokens: int = 4000, temperature: float = 0.7, 
@@ -69,73 +211,221 @@ class UnifiedAIClient:
             str: Generated text
             
         Raises:
-            Exception: If ChatZai fails after retries
+            Exception: If both ChatZai and Cerebras fail
         """
-        self.stats['total_requests'] += 1
+        with self._stats_lock:
+            self.stats.total_requests += 1
+            self._stats_dirty = True
+        if self.chat_zai_healthy is None:
+            self._probe_initial_health()
+        
+        # Circuit open: don't pay ChatZai's retry budget while it keeps failing
+        if not self._chat_zai_allowed():
+            logger.info("⚡ ChatZai circuit open, using Cerebras")
+            return self._generate_cerebras(prompt, system_prompt, max_tokens, temperature,
+                                           stream, use_reasoning, model_override)
         
-        # Use ChatZai only (with built-in 3 retries)
+        # Use ChatZai (with built-in 3 retries)
         try:
-            logger.info("🌐 Using ChatZai")
+            logger.debug("🌐 Using ChatZai")
             response = self.chat_zai.generate(
                 prompt=prompt,
                 system_prompt=system_prompt,
                 max_tokens=max_tokens,
                 temperature=temperature
             )
+            return self._finish_chat_zai(response)
             
-            # Check if response is too short (likely incomplete)
-            if len(response.strip()) < 50:
-                logger.warning(f"⚠️ ChatZai returned very short response ({len(response)} chars), may be incomplete")
-                raise Exception("ChatZai response too short, likely incomplete")
-            
-            self.stats['chat_zai_success'] += 1
-            logger.info("✓ ChatZai generation successful")
-            
-            # Auto-parse <start>...</end> tags
-            response = self._parse_response(response)
-            
-            return response
+        except Exception as e:
+            logger.error("✗ ChatZai failed after retries: %s", e)
+            self._mark_chat_zai_failed()
+        
+        # Fallback to Cerebras
+        logger.info("🔄 Falling back to Cerebras")
+        try:
+            return self._generate_cerebras(prompt, system_prompt, max_tokens, temperature,
+                                           stream, use_reasoning, model_override)
+        except Exception:
+            raise Exception(f"Both AI providers failed. ChatZai: {self.stats.chat_zai_failed}, Cerebras: {self.stats.cerebras_failed}")
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        max_tokens: int = 4000, temperature: float = 0.7) -> str:
+        """
+        Async version of generate() so several prompts can be awaited with asyncio.gather
+        
+        Raises:
+            Exception: If both ChatZai and Cerebras fail
+        """
+        with self._stats_lock:
+            self.stats.total_requests += 1
+            self._stats_dirty = True
+        if self.chat_zai_healthy is None:
+            await asyncio.to_thread(self._probe_initial_health)
+        
+        if not self._chat_zai_allowed():
+            logger.info("⚡ ChatZai circuit open, using Cerebras (async)")
+            return await asyncio.to_thread(self._generate_cerebras, prompt, system_prompt,
+                                           max_tokens, temperature)
+        
+        try:
+            logger.debug("🌐 Using ChatZai (async)")
+            response = await self.chat_zai.agenerate(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            return self._finish_chat_zai(response)
             
         except Exception as e:
-            logger.error(f"✗ ChatZai failed after retries: {e}")
-            self.stats['chat_zai_failed'] += 1
-            raise Exception(f"ChatZai generation failed: {e}")
+            logger.error("✗ ChatZai failed after retries: %s", e)
+            self._mark_chat_zai_failed()
+        
+        logger.info("🔄 Falling back to Cerebras (async)")
+        try:
+            return await asyncio.to_thread(self._generate_cerebras, prompt, system_prompt,
+                                           max_tokens, temperature)
+        except Exception:
+            raise Exception(f"Both AI providers failed. ChatZai: {self.stats.chat_zai_failed}, Cerebras: {self.stats.cerebras_failed}")
+    
+    def _finish_chat_zai(self, response: str) -> str:
+        """Validate a ChatZai response, record success and strip the answer prefix"""
+        # Strip once; the same string feeds the checks below and _parse_response
+        stripped = response.strip() if response else ''
+        
+        # Whitespace-only answer: fail fast instead of handing "" to JSON parsers downstream
+        if not stripped:
+            raise Exception("Empty response from ChatZai")
+        
+        # Check if response is too short (likely incomplete)
+        if len(stripped) < 50:
+            logger.warning("⚠️ ChatZai returned very short response (%d chars), may be incomplete", len(response))
+            raise Exception("ChatZai response too short, likely incomplete")
+        
+        with self._stats_lock:
+            self.stats.chat_zai_success += 1
+            self._stats_dirty = True
+        with self._breaker_lock:
+            self._breaker.update(fail_count=0, state='closed')
+        self.chat_zai_healthy = True
+        logger.debug("✓ ChatZai generation successful")
+        
+        # Auto-parse <start>...</end> tags
+        return self._parse_response(stripped)
+    
+    def generate_batch(self, prompts: list, max_tokens: int = 4000, temperature: float = 0.7,
+                       use_reasoning: bool = True, model_override: Optional[str] = None,
+                       system_prompt: Optional[str] = None) -> list:
+        """
+        Generate one completion per prompt in as few requests as possible
+        
+        ChatZai has no multi-completion API, so batches are served by Cerebras.
+        
+        Returns:
+            list: Generated texts, in the same order as prompts
+        """
+        with self._stats_lock:
+            self.stats.total_requests += len(prompts)
+            self._stats_dirty = True
+        try:
+            responses = self.cerebras.generate_batch(
+                prompts,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                use_reasoning=use_reasoning,
+                model_override=model_override,
+                system_prompt=system_prompt
+            )
         except Exception as e:
-            logger.error(f"✗ Cerebras failed: {e}")
-            self.stats['cerebras_failed'] += 1
-            raise Exception(f"Both AI providers failed. ChatZai: {self.stats['chat_zai_failed']}, Cerebras: {self.stats['cerebras_failed']}")
+            logger.error("✗ Cerebras batch failed: %s", e)
+            with self._stats_lock:
+                self.stats.cerebras_failed += len(prompts)
+                self._stats_dirty = True
+            raise
+        
+        with self._stats_lock:
+            self.stats.cerebras_success += len(prompts)
+            self._stats_dirty = True
+        return [self._parse_response(response) for response in responses]
+    
+    def generate_many(self, items: list, max_concurrency: int = 10) -> list:
+        """
+        Run generate() for many prompts concurrently (I/O bound, so threads are enough)
+        
+        Each request keeps its own retry/fallback handling; ChatZaiClient and
+        CerebrasClient already retry with backoff on transient errors.
+        
+        Args:
+            items: Prompt strings, or dicts of generate() keyword arguments
+            max_concurrency: Maximum requests in flight at once
+            
+        Returns:
+            list: Generated texts, in the same order as items
+            
+        Raises:
+            Exception: The first failing item (in input order), after in-flight requests finish
+        """
+        def run(item):
+            if isinstance(item, str):
+                return self.generate(item)
+            return self.generate(**item)
+        
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(items))) as executor:
+            return list(executor.map(run, items))
     
     def get_stats(self) -> dict:
         """
         Get usage statistics
         
         Returns:
-            dict: Statistics about provider usage
+            dict: Statistics about provider usage (shared snapshot, don't mutate)
         """
-        return {
-            **self.stats,
-            'chat_zai_healthy': self.chat_zai_healthy,
-            'success_rate': (
-                (self.stats['chat_zai_success'] + self.stats['cerebras_success']) / 
-                max(self.stats['total_requests'], 1)
-            ) * 100
-        }
+        with self._stats_lock:
+            cache = self._stats_cache
+            if self._stats_dirty or cache['chat_zai_healthy'] is not self.chat_zai_healthy:
+                cache = self._stats_cache = {
+                    **self.stats._asdict(),
+                    'chat_zai_healthy': self.chat_zai_healthy,
+                    'success_rate': self._success_rate()
+                }
+                self._stats_dirty = False
+            return cache
+    
+    def _success_rate(self) -> float:
+        """Percentage of requests served by either provider"""
+        return (self.stats.chat_zai_success + self.stats.cerebras_success) / max(self.stats.total_requests, 1) * 100
     
     def print_stats(self):
-        """Print usage statistics"""
-        stats = self.get_stats()
-        logger.info("=" * 60)
-        logger.info("AI Provider Statistics:")
-        logger.info(f"  Total Requests: {stats['total_requests']}")
-        logger.info(f"  ChatZai Success: {stats['chat_zai_success']}")
-        logger.info(f"  ChatZai Failed: {stats['chat_zai_failed']}")
-        logger.info(f"  Cerebras Success: {stats['cerebras_success']}")
-        logger.info(f"  Cerebras Failed: {stats['cerebras_failed']}")
-        logger.info(f"  Overall Success Rate: {stats['success_rate']:.1f}%")
-        logger.info(f"  ChatZai Health: {'✓ Healthy' if stats['chat_zai_healthy'] else '✗ Unhealthy'}")
-        logger.info("=" * 60)
+        """Print usage statistics (one log record, so one handler/lock cycle)"""
+        logger.info(
+            "%s\n"
+            "AI Provider Statistics:\n"
+            "  Total Requests: %d\n"
+            "  ChatZai Success: %d\n"
+            "  ChatZai Failed: %d\n"
+            "  Cerebras Success: %d\n"
+            "  Cerebras Failed: %d\n"
+            "  Overall Success Rate: %.1f%%\n"
+            "  ChatZai Health: %s\n"
+            "%s",
+            "=" * 60,
+            self.stats.total_requests,
+            self.stats.chat_zai_success,
+            self.stats.chat_zai_failed,
+            self.stats.cerebras_success,
+            self.stats.cerebras_failed,
+            self._success_rate(),
+            {True: '✓ Healthy', None: '? Not probed yet'}.get(self.chat_zai_healthy, '✗ Unhealthy'),
+            "=" * 60
+        )
     
     def close(self):
         """Close all client connections"""
         self.chat_zai.close()
         # Cerebras client doesn't need closing
+    
+    async def aclose(self):
+        """Close the async connections used by agenerate(); await it before the event loop ends"""
+        await self.chat_zai.aclose()
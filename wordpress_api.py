@@ -2,16 +2,66 @@
 WordPress REST API Client
 Posts content to WordPress via REST API
 """
+import asyncio
+import gzip
+import json
+import socket
+import httpx
 import requests
 import logging
+import time
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+try:
+    import orjson  # Optional: faster encoding of large post bodies
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# urllib3's defaults already disable Nagle (TCP_NODELAY); add TCP keep-alive probes so
+# idle pooled connections are not silently dropped between posts
+_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux only
+    _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections send TCP keep-alive probes (see _SOCKET_OPTIONS)"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = _SOCKET_OPTIONS
+        return super().init_poolmanager(*args, **kwargs)
+
+
 class WordPressAPI:
     """WordPress REST API client for posting articles"""
     
-    def __init__(self, site_url: str, username: str, app_password: str):
+    # /users/me and /categories rarely change within a run; reuse them for this long (seconds)
+    CACHE_TTL = 300
+    
+    # JSON bodies above this size are gzipped when gzip_requests is enabled
+    GZIP_MIN_BYTES = 4096
+    
+    # /posts payload fields, in payload order: (payload key, _build_post_data argument)
+    _POST_FIELDS = (
+        ('title', 'title'),
+        ('content', 'content'),
+        ('status', 'status'),
+        ('slug', 'slug'),
+        ('author', 'author_id'),
+        ('categories', 'category_ids'),
+        ('tags', 'tags'),
+    )
+    # Generated payload builders, keyed by which _POST_FIELDS were given (not None)
+    _post_data_builders = {}
+    
+    def __init__(self, site_url: str, username: str, app_password: str, pool_size: int = 20,
+                 gzip_requests: bool = False, timeout: int = 30):
         """
         Initialize WordPress API client
         
@@ -19,42 +69,124 @@ class WordPressAPI:
             site_url: WordPress site URL (e.g., https://yoursite.com)
             username: WordPress username
             app_password: WordPress Application Password
+            pool_size: Max pooled keep-alive connections to the site (raise for threaded posting)
+            gzip_requests: Send large post bodies with Content-Encoding: gzip. Only enable
+                if the server decodes gzipped request bodies (e.g. Apache mod_deflate input filter)
+            timeout: Per-request timeout in seconds for every WordPress call
         """
         self.site_url = site_url.rstrip('/')
         self.username = username
         self.app_password = app_password
         self.api_base = f"{self.site_url}/wp-json/wp/v2"
+        self.gzip_requests = gzip_requests
+        self.timeout = timeout
         
         # Create session with auth
         self.session = requests.Session()
         self.session.auth = (username, app_password)
         self.session.headers.update({
-            'User-Agent': 'Amazon-WP-Poster/1.0'
+            'User-Agent': 'Amazon-WP-Poster/1.0',
+            'Accept-Encoding': 'gzip'
         })
         
+        # Sized keep-alive pool + the one retry policy for transient errors
+        # (connect/read/status, honouring Retry-After). POST is not retried:
+        # a replayed create would duplicate the post.
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=3,
+            status=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'DELETE']),
+            respect_retry_after_header=True
+        )
+        adapter = KeepAliveAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Bound once so session calls skip the per-call attribute lookups
+        self._get = self.session.get
+        self._post = self.session.post
+        self._delete = self.session.delete
+        
+        # TTL caches for invariant lookups (see invalidate_cache)
+        self._user_cache = None
+        self._user_cache_ts = 0.0
+        self._categories_cache = None
+        self._categories_cache_ts = 0.0
+        
         logging.info(f"✅ WordPress API initialized: {self.site_url}")
     
+    def invalidate_cache(self):
+        """Drop cached /users/me and /categories results so the next call refetches"""
+        self._user_cache = None
+        self._categories_cache = None
+    
+    def _cache_fresh(self, cached, cached_ts: float) -> bool:
+        """Check if a cached lookup exists and is younger than CACHE_TTL"""
+        return cached is not None and time.monotonic() - cached_ts < self.CACHE_TTL
+    
+    def _encode_json(self, payload: dict) -> tuple:
+        """
+        Serialize a JSON request body, gzip-compressing large bodies when enabled
+        
+        Article HTML is 20-100 KB and compresses several times over,
+        so this cuts upload size on create/update.
+        
+        Returns:
+            tuple: (body bytes, request headers)
+        """
+        body = orjson.dumps(payload) if orjson else json.dumps(payload).encode('utf-8')
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+        if self.gzip_requests and len(body) > self.GZIP_MIN_BYTES:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        return body, headers
+    
+    def _post_json(self, url: str, payload: dict) -> requests.Response:
+        """POST a JSON payload (see _encode_json)"""
+        body, headers = self._encode_json(payload)
+        
+        # Pooled session (auth + User-Agent), explicit JSON headers per request
+        return self._post(
+            url,
+            data=body,
+            headers=headers,
+            timeout=self.timeout
+        )
+    
     def test_connection(self) -> bool:
         """Test API connection and authentication"""
+        if self._cache_fresh(self._user_cache, self._user_cache_ts):
+            logging.info(f"✅ Connected as: {self._user_cache.get('name', 'Unknown')} (cached)")
+            return True
+        
         try:
             # Use minimal headers for GET request
-            response = requests.get(
+            response = self._get(
                 f"{self.api_base}/users/me",
-                auth=(self.username, self.app_password),
+                params={'_fields': 'id,name'},
                 headers={
                     'Accept': 'application/json'
                 },
-                timeout=30
+                timeout=self.timeout
             )
             if response.status_code == 200:
                 user = response.json()
+                self._user_cache = user
+                self._user_cache_ts = time.monotonic()
                 logging.info(f"✅ Connected as: {user.get('name', 'Unknown')}")
                 return True
             else:
                 logging.error(f"❌ Auth failed: {response.status_code} - {response.text}")
                 return False
         except requests.exceptions.Timeout:
-            logging.error(f"❌ Connection test timeout (30s)")
+            logging.error(f"❌ Connection test timeout ({self.timeout}s)")
             return False
         except requests.exceptions.ConnectionError as e:
             logging.error(f"❌ Connection error: {e}")
@@ -86,113 +218,140 @@ class WordPressAPI:
         """
         logging.info(f"📤 Creating post: {title}")
         
-        # Build post data
-        post_data = {
-            'title': title,
-            'content': content,
-            'status': status,
-        }
-
-        if slug:
-            post_data['slug'] = slug
+        post_data = self._build_post_data(title, content, status, author_id, category_ids, tags, slug)
         
-        if author_id:
-            post_data['author'] = author_id
+        try:
+            response = self._post_json(f"{self.api_base}/posts", post_data)
+            return self._parse_create_response(response)
         
-        if category_ids:
-            post_data['categories'] = category_ids
+        except requests.exceptions.RequestException as e:
+            logging.error(f"❌ Request error: {e}")
+            raise
+    
+    @classmethod
+    def _build_post_data(cls, title: str, content: str, status: str = 'draft',
+                         author_id: Optional[int] = None, category_ids: Optional[list] = None,
+                         tags: Optional[list] = None, slug: Optional[str] = None) -> dict:
+        """Build a /posts payload (only fields that were actually given)"""
+        args = (title, content, status, slug, author_id, category_ids, tags)  # _POST_FIELDS order
+        given = tuple(value is not None for value in args)
+        builder = cls._post_data_builders.get(given)
+        if builder is None:
+            builder = cls._post_data_builders[given] = cls._compile_post_data_builder(given)
+        return builder(*args)
+    
+    @classmethod
+    def _compile_post_data_builder(cls, given: tuple):
+        """
+        Generate a branch-free payload builder for one combination of given fields
         
-        if tags:
-            post_data['tags'] = tags
+        Callers almost always pass the same fields, so in practice only one or two
+        builders are ever compiled. The source is built from _POST_FIELDS names only.
+        """
+        params = ', '.join(arg for _, arg in cls._POST_FIELDS)
+        items = ', '.join(f"'{key}': {arg}" for (key, arg), is_given in zip(cls._POST_FIELDS, given) if is_given)
+        namespace = {}
+        exec(f"def build({params}):\n    return {{{items}}}\n", namespace)
+        return namespace['build']
+    
+    def _parse_create_response(self, response) -> dict:
+        """
+        Turn a /posts create response (requests or httpx) into create_post()'s result dict
         
-        try:
-            # Use requests.post directly with explicit headers
-            response = requests.post(
-                f"{self.api_base}/posts",
-                json=post_data,
-                auth=(self.username, self.app_password),
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json'
-                },
-                timeout=30
-            )
-            
-            if response.status_code in [200, 201]:
-                try:
-                    post = response.json()
-                except ValueError:
-                    logging.error(f"❌ Post creation response is not JSON. Raw: {response.text[:500]}")
-                    raise
+        Raises:
+            Exception: If WordPress rejected the post or the response is malformed
+        """
+        if response.status_code in [200, 201]:
+            try:
+                post = response.json()
+            except ValueError:
+                logging.error(f"❌ Post creation response is not JSON. Raw: {response.text[:500]}")
+                raise
 
-                logging.info(f"✅ Post created successfully!")
-                logging.debug(f"   Response keys: {list(post.keys())}")
+            logging.debug("   Response keys: %s", list(post.keys()))
 
-                post_id = post.get('id') or post.get('ID')
-                post_link = post.get('link') or post.get('guid', {}).get('rendered', '')
-                post_status = post.get('status', 'unknown')
+            post_id = post.get('id') or post.get('ID')
+            post_link = post.get('link') or post.get('guid', {}).get('rendered', '')
+            post_status = post.get('status', 'unknown')
 
-                if not post_id:
-                    logging.error(f"❌ Unexpected response format, missing 'id'. Raw: {post}")
-                    raise Exception("Unexpected WordPress response format (missing id)")
+            if not post_id:
+                logging.error(f"❌ Unexpected response format, missing 'id'. Raw: {post}")
+                raise Exception("Unexpected WordPress response format (missing id)")
 
-                logging.info(f"   ID: {post_id}")
-                logging.info(f"   Status: {post_status}")
-                logging.info(f"   URL: {post_link}")
-                
-                return {
-                    'success': True,
-                    'id': post_id,
-                    'url': post_link,
-                    'status': post_status,
-                    'title': post.get('title', {}).get('rendered', '') or post.get('title', {})
-                }
-            else:
-                error_msg = f"Failed to create post: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_msg += f" - {error_data.get('message', response.text)}"
-                except:
-                    error_msg += f" - {response.text}"
-                
-                logging.error(f"❌ {error_msg}")
-                raise Exception(error_msg)
+            logging.info("✅ Post created id=%s status=%s url=%s", post_id, post_status, post_link)
+            
+            return {
+                'success': True,
+                'id': post_id,
+                'url': post_link,
+                'status': post_status,
+                'title': post.get('title', {}).get('rendered', '') or post.get('title', {})
+            }
+        else:
+            error_msg = f"Failed to create post: {response.status_code}"
+            try:
+                error_data = response.json()
+                error_msg += f" - {error_data.get('message', response.text)}"
+            except:
+                error_msg += f" - {response.text}"
+            
+            logging.error(f"❌ {error_msg}")
+            raise Exception(error_msg)
+    
+    async def create_posts_batch(self, posts: list, concurrency: int = 5) -> list:
+        """
+        Create many posts concurrently (bulk publish)
         
-        except requests.exceptions.Timeout:
-            logging.error("❌ Request timeout")
-            raise Exception("WordPress API request timeout")
-        except requests.exceptions.RequestException as e:
-            logging.error(f"❌ Request error: {e}")
-            raise
-        except Exception as e:
-            logging.error(f"❌ Unexpected error: {e}")
-            raise
+        Args:
+            posts: One dict of create_post() keyword arguments per post
+            concurrency: Max posts in flight; keep at or below the site's PHP worker count
+        
+        Returns:
+            list: create_post() result per post, in input order. A failed post yields
+                  {'success': False, 'error': ..., 'title': ...} instead of raising
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        
+        async with httpx.AsyncClient(auth=(self.username, self.app_password),
+                                     limits=limits, timeout=self.timeout) as client:
+            async def post_one(post: dict) -> dict:
+                async with semaphore:
+                    logging.info(f"📤 Creating post: {post.get('title')}")
+                    try:
+                        body, headers = self._encode_json(self._build_post_data(**post))
+                    except (TypeError, ValueError) as e:
+                        # Bad post dict (unknown/missing kwargs, unserializable value)
+                        logging.error(f"❌ Invalid post: {e}")
+                        return {'success': False, 'error': str(e), 'title': post.get('title')}
+                    
+                    try:
+                        response = await client.post(f"{self.api_base}/posts", content=body, headers=headers)
+                        return self._parse_create_response(response)
+                    except httpx.HTTPError as e:
+                        logging.error(f"❌ Request error: {e}")
+                        return {'success': False, 'error': str(e), 'title': post.get('title')}
+                    except Exception as e:
+                        # Already logged by _parse_create_response
+                        return {'success': False, 'error': str(e), 'title': post.get('title')}
+            
+            return await asyncio.gather(*(post_one(post) for post in posts))
     
     def update_post(self, post_id: int, title: Optional[str] = None, 
                    content: Optional[str] = None, status: Optional[str] = None) -> dict:
         """Update an existing post"""
         logging.info(f"📝 Updating post ID: {post_id}")
         
-        update_data = {}
-        if title:
-            update_data['title'] = title
-        if content:
-            update_data['content'] = content
-        if status:
-            update_data['status'] = status
+        update_data = {
+            key: value for key, value in (
+                ('title', title),
+                ('content', content),
+                ('status', status),
+            ) if value is not None
+        }
         
         try:
-            # Use requests.post directly with explicit headers
-            response = requests.post(
-                f"{self.api_base}/posts/{post_id}",
-                json=update_data,
-                auth=(self.username, self.app_password),
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json'
-                },
-                timeout=30
-            )
+            response = self._post_json(f"{self.api_base}/posts/{post_id}", update_data)
             
             if response.status_code == 200:
                 post = response.json()
@@ -218,7 +377,7 @@ class WordPressAPI:
             if force:
                 url += "?force=true"
             
-            response = self.session.delete(url, timeout=30)
+            response = self._delete(url, timeout=self.timeout)
             
             if response.status_code == 200:
                 logging.info("✅ Post deleted successfully!")
@@ -231,16 +390,22 @@ class WordPressAPI:
             raise
     
     def get_categories(self) -> list:
-        """Get all available categories"""
+        """Get all available categories (cached for CACHE_TTL seconds)"""
+        if self._cache_fresh(self._categories_cache, self._categories_cache_ts):
+            return self._categories_cache
+        
         try:
-            response = self.session.get(
+            response = self._get(
                 f"{self.api_base}/categories",
-                params={'per_page': 100},
-                timeout=10
+                # Server-side projection: only the fields select_category() needs
+                params={'per_page': 100, '_fields': 'id,name,slug,parent'},
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
                 categories = response.json()
+                self._categories_cache = categories
+                self._categories_cache_ts = time.monotonic()
                 logging.info(f"✅ Retrieved {len(categories)} categories")
                 return categories
             else: